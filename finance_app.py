@@ -1,36 +1,493 @@
 # finance_app.py
 import sys
 import os
+import atexit
+import calendar
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import date, datetime, timedelta
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QDateEdit,
+    QPushButton, QTableView, QMessageBox, QDateEdit,
     QLabel, QGroupBox, QTabWidget, QComboBox, QLineEdit, QDoubleSpinBox,
     QHeaderView, QDialog, QDialogButtonBox, QFormLayout, QCheckBox, QSpinBox,
-    QCalendarWidget, QTextEdit
+    QCalendarWidget, QTextEdit, QStyledItemDelegate, QStyleOptionButton, QStyle
 )
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QFont, QColor, QTextCharFormat
+from PyQt6.QtCore import (
+    Qt, QDate, QEvent, QObject, QRunnable, QThreadPool, QSettings, QTimer, pyqtSignal,
+    QAbstractTableModel, QModelIndex
+)
+from PyQt6.QtGui import QFont, QColor, QBrush, QTextCharFormat
 
 DB_FILE = "finance.db"
 
+# Applied once to each new connection. WAL with synchronous=NORMAL skips the
+# extra fsync per commit while staying safe against corruption; note that
+# finance.db-wal and finance.db-shm are part of the database and must be
+# copied/backed up together with finance.db.
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA busy_timeout=20000;
+"""
+
+# Statements shared by several call sites. Keeping one copy of each string
+# means sqlite3's per-connection statement cache hits instead of re-preparing
+# the same SQL for every call.
+
+# effective_type ('income' / 'credit' / 'debit') is filled in from the payment
+# being recorded so that monthly totals don't need to join recurring_payments
+SQL_EFFECTIVE_TYPE = """
+    CASE
+        WHEN {kind} = 'income' THEN 'income'
+        WHEN {kind} = 'recurring' AND LOWER((SELECT payment_type FROM recurring_payments WHERE id = {payment_id})) = 'credit' THEN 'credit'
+        ELSE 'debit'
+    END
+"""
+SQL_INSERT_HISTORY = f"""
+    INSERT INTO payment_history (payment_id, payment_type, name, amount, payment_date, month, year, effective_type)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, {SQL_EFFECTIVE_TYPE.format(kind='?2', payment_id='?1')})
+"""
+# Single-row form that hands back the new history id in the same statement
+SQL_INSERT_HISTORY_RETURNING = SQL_INSERT_HISTORY.rstrip() + " RETURNING id\n"
+SQL_INSERT_RECENT = """
+    INSERT INTO recent_transactions
+    (history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Undo entries for every history row added after a given id, in one statement
+SQL_RECENT_FROM_HISTORY = """
+    INSERT INTO recent_transactions 
+    (history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date)
+    SELECT ph.id, ph.payment_id, ph.payment_type, ph.name, ph.amount, ph.payment_date, ph.month, ph.year, 'mark_paid',
+           CASE WHEN ph.payment_type = 'recurring'
+                THEN (SELECT last_paid_date FROM recurring_payments WHERE id = ph.payment_id)
+           END
+    FROM payment_history ph
+    WHERE ph.id > ?
+    ORDER BY ph.id
+    RETURNING id, history_id, payment_id, payment_type, name, amount,
+              payment_date, month, year, action_type, old_last_paid_date
+"""
+SQL_SET_LAST_PAID = "UPDATE recurring_payments SET last_paid_date = ? WHERE id = ?"
+SQL_SET_LAST_RECEIVED = "UPDATE recurring_income SET last_received_date = ? WHERE id = ?"
+SQL_SET_ONE_TIME_PAID = "UPDATE one_time_payments SET paid = ? WHERE id = ?"
+# Marks one unpaid one-time payment as paid, returning its date; no row means
+# it was already paid
+SQL_MARK_ONE_TIME_PAID = "UPDATE one_time_payments SET paid = 1 WHERE id = ? AND paid = 0 RETURNING payment_date"
+
+# Stylesheets are applied once to the QApplication in __main__ so every window
+# and dialog inherits them instead of re-parsing its own copy on construction
+APP_QSS = """
+    QMainWindow {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #1a1a2e, stop:1 #16213e);
+        color: #ffffff;
+    }
+    QWidget {
+        background: transparent;
+        color: #ffffff;
+    }
+    QGroupBox {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #2d3748, stop:1 #1a202c);
+        border: 2px solid #4a5568;
+        border-radius: 10px;
+        margin-top: 15px;
+        padding-top: 15px;
+        color: #ffffff;
+        font-weight: bold;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 15px;
+        padding: 5px 10px;
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        border-radius: 5px;
+        color: #ffffff;
+        font-weight: bold;
+    }
+    QTableView {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #2d3748, stop:1 #1a202c);
+        color: #ffffff;
+        gridline-color: #4a5568;
+        border: 2px solid #4a5568;
+        border-radius: 8px;
+        selection-background-color: #667eea;
+        selection-color: #ffffff;
+    }
+    QTableView::item {
+        background-color: transparent;
+        color: #ffffff;
+        padding: 5px;
+    }
+    QTableView::item:selected {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        color: #ffffff;
+    }
+    QTableView::item:hover {
+        background-color: #4a5568;
+    }
+    QHeaderView::section {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        color: #ffffff;
+        padding: 8px;
+        border: none;
+        font-weight: bold;
+    }
+    QTabWidget::pane {
+        border: 2px solid #4a5568;
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #1a1a2e, stop:1 #16213e);
+        border-radius: 8px;
+    }
+    QTabBar::tab {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #2d3748, stop:1 #1a202c);
+        color: #a0aec0;
+        padding: 10px 20px;
+        margin-right: 3px;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        border: 1px solid #4a5568;
+        font-weight: bold;
+    }
+    QTabBar::tab:selected {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        color: #ffffff;
+        border-bottom: 2px solid #667eea;
+    }
+    QTabBar::tab:hover {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #3d4758, stop:1 #2a3448);
+        color: #ffffff;
+    }
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        color: #ffffff;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 11pt;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #7c8bf0, stop:1 #8a5fb8);
+        transform: scale(1.05);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #5568d9, stop:1 #6a3a92);
+    }
+    QLineEdit, QDoubleSpinBox, QDateEdit {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #2d3748, stop:1 #1a202c);
+        color: #ffffff;
+        border: 2px solid #4a5568;
+        border-radius: 6px;
+        padding: 6px;
+        selection-background-color: #667eea;
+    }
+    QLineEdit:focus, QDoubleSpinBox:focus, QDateEdit:focus {
+        border: 2px solid #667eea;
+    }
+    QComboBox {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #2d3748, stop:1 #1a202c);
+        color: #ffffff;
+        border: 2px solid #4a5568;
+        border-radius: 6px;
+        padding: 5px;
+    }
+    QComboBox:hover {
+        border: 2px solid #667eea;
+    }
+    QComboBox::drop-down {
+        border: none;
+        background: transparent;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 5px solid #ffffff;
+        margin-right: 5px;
+    }
+    QComboBox QAbstractItemView {
+        background: #2d3748;
+        border: 2px solid #667eea;
+        border-radius: 6px;
+        selection-background-color: #667eea;
+        selection-color: #ffffff;
+    }
+    QLabel {
+        color: #ffffff;
+    }
+    QScrollBar:vertical {
+        background: #2d3748;
+        width: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        min-height: 20px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #7c8bf0, stop:1 #8a5fb8);
+    }
+    QScrollBar:horizontal {
+        background: #2d3748;
+        height: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:horizontal {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        min-width: 20px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:horizontal:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #7c8bf0, stop:1 #8a5fb8);
+    }
+    QMessageBox {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #1a1a2e, stop:1 #16213e);
+    }
+    QMessageBox QLabel {
+        color: #ffffff;
+    }
+    QMessageBox QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #667eea, stop:1 #764ba2);
+        color: #ffffff;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+        min-width: 80px;
+    }
+    QMessageBox QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+            stop:0 #7c8bf0, stop:1 #8a5fb8);
+    }
+"""
+
+DIALOG_QSS = """
+    PaymentDialog, IncomeDialog, OneTimePaymentDialog {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+            stop:0 #1a1a2e, stop:1 #16213e);
+    }
+    PaymentDialog QLabel, IncomeDialog QLabel, OneTimePaymentDialog QLabel {
+        color: #ffffff;
+        font-weight: bold;
+    }
+"""
+
+# Net savings label, green when saving and red when in deficit
+NET_SAVINGS_POSITIVE_QSS = """
+    color: #48bb78;
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+        stop:0 rgba(72, 187, 120, 0.3), stop:1 rgba(72, 187, 120, 0.1));
+    border: 2px solid #48bb78;
+    border-radius: 10px;
+    padding: 15px;
+"""
+
+NET_SAVINGS_NEGATIVE_QSS = """
+    color: #f56565;
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+        stop:0 rgba(245, 101, 101, 0.3), stop:1 rgba(245, 101, 101, 0.1));
+    border: 2px solid #f56565;
+    border-radius: 10px;
+    padding: 15px;
+"""
+
+# Colors of the calendar day details
+DETAILS_TITLE_COLOR = "#667eea"
+DETAILS_TEXT_COLOR = "#ffffff"
+DETAILS_MUTED_COLOR = "#a0a0a0"
+DETAILS_RULE_COLOR = "#4a5568"
+DETAILS_OUT_COLOR = "#ff6b6b"
+DETAILS_OUT_ITEM_COLOR = "#ff8787"
+DETAILS_IN_COLOR = "#51cf66"
+DETAILS_IN_ITEM_COLOR = "#69db7c"
+
+# Bump whenever init_database() gains a new table, column or index so that
+# existing database files run the (idempotent) schema setup once more
+SCHEMA_VERSION = 7
+
+@lru_cache(maxsize=64)
+def month_bounds(year, month):
+    """First day of a month and first day of the month after it"""
+    return date(year, month, 1), date(year + (month == 12), month % 12 + 1, 1)
+
+@lru_cache(maxsize=64)
+def last_day_of_month(year, month):
+    """Last date of a month"""
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+@lru_cache(maxsize=256)
+def day_in_month(year, month, day):
+    """Date for a payment day, clamped to the last day of short months"""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+@lru_cache(maxsize=1024)
+def payment_dates(payment_day, last_paid_date, current_month, current_year):
+    """Last, this and next month's payment dates for a recurring payment"""
+    first_day, next_first_day = month_bounds(current_year, current_month)
+    
+    # Calculate this month's payment date
+    this_month_date = day_in_month(current_year, current_month, payment_day)
+    
+    # Calculate last month's payment date
+    if last_paid_date:
+        last_month_date = date.fromisoformat(last_paid_date)
+    else:
+        # Calculate previous month
+        prev_month_end = first_day - timedelta(days=1)
+        last_month_date = day_in_month(prev_month_end.year, prev_month_end.month, payment_day)
+    
+    # Calculate next month's payment date
+    next_month_date = day_in_month(next_first_day.year, next_first_day.month, payment_day)
+    
+    return last_month_date, this_month_date, next_month_date
+
+@lru_cache(maxsize=1024)
+def parse_date(value):
+    """Date part of a stored 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' string"""
+    # The same few dates repeat across rows and refreshes, so cache the parse
+    return date.fromisoformat(value[:10])
+
+@lru_cache(maxsize=512)
+def display_date(value):
+    """Format a date as DD/MM/YYYY for the tables"""
+    # Recurring rows share a handful of distinct dates, so most calls are hits;
+    # plain field formatting skips strftime's locale-aware path on a miss
+    return f"{value.day:02d}/{value.month:02d}/{value.year:04d}"
+
+MONTHS = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+)
+
+def gbp(value):
+    """Format an amount as pounds"""
+    return '£' + format(value, ',.2f')
+
+def month_label(month, year):
+    """'January 2025' style name of a month"""
+    return f"{MONTHS[month - 1]} {year}"
+
+def qdate_to_iso(qdate):
+    """Format a QDate as the YYYY-MM-DD string stored in the database"""
+    return qdate.toString(Qt.DateFormat.ISODate)
+
+def iso_to_qdate(value):
+    """Parse a YYYY-MM-DD database date into a QDate"""
+    return QDate.fromString(value, Qt.DateFormat.ISODate)
+
+@contextmanager
+def batched(table):
+    """Suspend repaints, signals and sorting on a table while it is refilled"""
+    sorting = table.isSortingEnabled()
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    table.setSortingEnabled(False)
+    try:
+        yield table
+    finally:
+        table.setSortingEnabled(sorting)
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
+
 class Database:
     def __init__(self, db_file=DB_FILE):
         self.db_file = db_file
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
         self.init_database()
+        atexit.register(self.close)
     
     def get_connection(self):
-        # Use WAL mode for better concurrency and set timeout
-        conn = sqlite3.connect(self.db_file, timeout=20.0)
-        # Enable WAL mode for better concurrent access
-        conn.execute("PRAGMA journal_mode=WAL")
+        """Return this thread's long-lived connection, opening it on first use"""
+        # One long-lived connection per thread keeps SQLite's page cache warm
+        # between queries instead of paying connect + pragma cost on every call.
+        # Worker threads get their own so that a background write never shares
+        # a transaction with the GUI thread; WAL lets them read concurrently.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False, cached_statements=512)
+            conn.executescript(CONNECTION_PRAGMAS)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
         return conn
     
+    @contextmanager
+    def transaction(self):
+        """Yield a cursor on this thread's connection; commit on success, roll back on error"""
+        conn = self.get_connection()
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    
+    def close(self):
+        """Close every connection opened so far (registered to run at exit)"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+    
+    def data_stamp(self):
+        """Modification times of the database and its WAL file"""
+        # Writes land in the -wal file until a checkpoint, so both are needed
+        # to notice changes made outside the app (e.g. notification_service)
+        stamp = []
+        for path in (self.db_file, self.db_file + "-wal"):
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamp.append(0)
+        return tuple(stamp)
+    
+    def _table_columns(self, cursor, table):
+        """Return the set of column names currently defined on a table"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+    
     def init_database(self):
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # Skip the schema block entirely once this file is up to date
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
+        # Run all creates/migrations as a single transaction
+        cursor.execute("BEGIN")
+        
         # Recurring payments table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS recurring_payments (
@@ -44,41 +501,26 @@ class Database:
             )
         ''')
         
-        # Add payment_type column if it doesn't exist (migration)
-        try:
+        # Add columns introduced after the table was first created (migrations)
+        columns = self._table_columns(cursor, "recurring_payments")
+        
+        if 'payment_type' not in columns:
             cursor.execute("ALTER TABLE recurring_payments ADD COLUMN payment_type TEXT DEFAULT 'debit'")
-        except sqlite3.OperationalError:
-            # Column already exists, ignore
-            pass
         
-        # Add delete_next_month column if it doesn't exist (migration)
-        try:
+        if 'delete_next_month' not in columns:
             cursor.execute("ALTER TABLE recurring_payments ADD COLUMN delete_next_month INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            # Column already exists, ignore
-            pass
         
-        # Add pay_period_months column if it doesn't exist (migration)
-        # NULL or -1 means infinite, otherwise number of months
-        try:
+        # pay_period_months: NULL or -1 means infinite, otherwise number of months
+        if 'pay_period_months' not in columns:
             cursor.execute("ALTER TABLE recurring_payments ADD COLUMN pay_period_months INTEGER DEFAULT NULL")
-        except sqlite3.OperationalError:
-            # Column already exists, ignore
-            pass
         
-        # Add period_start_date column to track when the pay period started
-        try:
+        # period_start_date tracks when the pay period started
+        if 'period_start_date' not in columns:
             cursor.execute("ALTER TABLE recurring_payments ADD COLUMN period_start_date DATE")
-        except sqlite3.OperationalError:
-            # Column already exists, ignore
-            pass
         
-        # Add is_active column to track if payment is still active
-        try:
+        # is_active tracks if payment is still active
+        if 'is_active' not in columns:
             cursor.execute("ALTER TABLE recurring_payments ADD COLUMN is_active INTEGER DEFAULT 1")
-        except sqlite3.OperationalError:
-            # Column already exists, ignore
-            pass
         
         # Recurring income table
         cursor.execute('''
@@ -115,10 +557,20 @@ class Database:
                 payment_date DATE NOT NULL,
                 month INTEGER NOT NULL,
                 year INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                effective_type TEXT
             )
         ''')
         
+        # Credit/debit/income classification stored on each history row
+        if 'effective_type' not in self._table_columns(cursor, "payment_history"):
+            cursor.execute("ALTER TABLE payment_history ADD COLUMN effective_type TEXT")
+        cursor.execute(f"""
+            UPDATE payment_history
+            SET effective_type = {SQL_EFFECTIVE_TYPE.format(kind='payment_type', payment_id='payment_history.payment_id')}
+            WHERE effective_type IS NULL
+        """)
+        
         # Recent transactions for undo (stores last 10 transactions)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS recent_transactions (
@@ -147,12 +599,24 @@ class Database:
                 total_income REAL DEFAULT 0,
                 savings_amount REAL DEFAULT 0,
                 net_savings REAL DEFAULT 0,
+                received_income REAL DEFAULT 0,
+                credit_paid REAL DEFAULT 0,
+                debit_paid REAL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(month, year)
             )
         ''')
         
+        # Paid/received totals are kept on monthly_summary so the Summary tab
+        # reads one row instead of scanning payment_history
+        summary_columns = self._table_columns(cursor, "monthly_summary")
+        backfill_summaries = False
+        for column in ('received_income', 'credit_paid', 'debit_paid'):
+            if column not in summary_columns:
+                cursor.execute(f"ALTER TABLE monthly_summary ADD COLUMN {column} REAL DEFAULT 0")
+                backfill_summaries = True
+        
         # App settings table to track last deletion check
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS app_settings (
@@ -163,14 +627,370 @@ class Database:
         ''')
         
         # Add old_last_paid_date column to recent_transactions if it doesn't exist
-        try:
+        if 'old_last_paid_date' not in self._table_columns(cursor, "recent_transactions"):
             cursor.execute("ALTER TABLE recent_transactions ADD COLUMN old_last_paid_date DATE")
-        except sqlite3.OperationalError:
-            # Column already exists, ignore
-            pass
         
+        # Indexes for the month/year, payment and active-status filters used
+        # by the summary, history and startup checks
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_month_year ON payment_history(year, month)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_payment_id ON payment_history(payment_id, payment_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rp_active ON recurring_payments(is_active, period_start_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_onetime_date ON one_time_payments(payment_date, paid)")
+        # Paid-this-month lookups filter on type + month/year (+ payment); upcoming
+        # one-time payments filter on paid = 0 and a date range
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ph_type_month_year ON payment_history(payment_type, month, year, payment_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_otp_date_paid ON one_time_payments(paid, payment_date)")
+        # Expiry check: only active payments with a finite pay period are candidates
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_rp_active_period ON recurring_payments(pay_period_months)
+            WHERE is_active = 1 AND pay_period_months IS NOT NULL AND pay_period_months != -1
+        """)
+        # Partial index: normally empty, so the pending-deletion lookup is a single probe
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending_del ON recurring_payments(delete_next_month) WHERE delete_next_month = 1")
+        
+        if backfill_summaries:
+            cursor.execute("SELECT DISTINCT month, year FROM payment_history")
+            self.write_month_summaries(cursor, cursor.fetchall())
+        
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
-        conn.close()
+        
+        # Refresh planner statistics so the new indexes get used
+        cursor.execute("ANALYZE")
+        conn.commit()
+    
+    def scheduled_income_total(self):
+        """Total of all recurring income"""
+        cursor = self.get_connection().execute("SELECT COALESCE(SUM(amount), 0) FROM recurring_income")
+        return cursor.fetchone()[0]
+    
+    def scheduled_month_totals(self, month, year):
+        """Scheduled totals for a month keyed by 'income' / 'credit' / 'debit' / 'one_time' in one query"""
+        first_day, next_first_day = month_bounds(year, month)
+        cursor = self.get_connection().execute("""
+            SELECT 'income' AS kind, COALESCE(SUM(amount), 0)
+            FROM recurring_income
+            UNION ALL
+            SELECT CASE WHEN LOWER(payment_type) = 'credit' THEN 'credit' ELSE 'debit' END, SUM(amount)
+            FROM recurring_payments
+            WHERE COALESCE(is_active, 1) = 1
+            GROUP BY 1
+            UNION ALL
+            SELECT 'one_time', COALESCE(SUM(amount), 0)
+            FROM one_time_payments
+            WHERE payment_date >= ? AND payment_date < ?
+        """, (first_day.isoformat(), next_first_day.isoformat()))
+        return dict(cursor.fetchall())
+    
+    def month_history_totals(self, month, year):
+        """Payment history totals for a month keyed by 'income' / 'credit' / 'debit'"""
+        # Recurring payments take credit/debit from the payment; one-time payments are always debit
+        cursor = self.get_connection().execute("""
+            SELECT effective_type, SUM(amount)
+            FROM payment_history
+            WHERE payment_type IN ('income', 'recurring', 'one_time') AND year = ? AND month = ?
+            GROUP BY effective_type
+        """, (year, month))
+        return dict(cursor.fetchall())
+    
+    def calendar_day_totals(self, month, year, last_day):
+        """Outgoing/incoming totals per day of a month, for days that have any entries"""
+        # Payment/income days past the end of the month fall on its last day
+        first_day, next_first_day = month_bounds(year, month)
+        cursor = self.get_connection().execute("""
+            SELECT day, SUM(outgoing), SUM(incoming)
+            FROM (
+                SELECT MIN(CAST(payment_day AS INTEGER), ?) AS day, amount AS outgoing, 0 AS incoming
+                FROM recurring_payments
+                WHERE COALESCE(is_active, 1) = 1
+                UNION ALL
+                SELECT CAST(strftime('%d', payment_date) AS INTEGER), amount, 0
+                FROM one_time_payments
+                WHERE payment_date >= ? AND payment_date < ?
+                UNION ALL
+                SELECT MIN(CAST(income_day AS INTEGER), ?), 0, amount
+                FROM recurring_income
+            )
+            GROUP BY day
+        """, (last_day, first_day.isoformat(), next_first_day.isoformat(), last_day))
+        return cursor.fetchall()
+    
+    def calendar_day_entries(self, month, year, day, last_day):
+        """(direction, label, amount) for each payment and income falling on one day of a month"""
+        day_start = date(year, month, day)
+        cursor = self.get_connection().execute("""
+            SELECT 'outgoing',
+                   name || CASE WHEN LOWER(COALESCE(payment_type, 'debit')) = 'credit' THEN ' (Credit)' ELSE ' (Debit)' END,
+                   amount
+            FROM recurring_payments
+            WHERE COALESCE(is_active, 1) = 1 AND MIN(CAST(payment_day AS INTEGER), ?) = ?
+            UNION ALL
+            SELECT 'outgoing', name || ' (one-time)', amount
+            FROM one_time_payments
+            WHERE payment_date >= ? AND payment_date < ?
+            UNION ALL
+            SELECT 'incoming', name, amount
+            FROM recurring_income
+            WHERE MIN(CAST(income_day AS INTEGER), ?) = ?
+        """, (last_day, day, day_start.isoformat(), (day_start + timedelta(days=1)).isoformat(), last_day, day))
+        return cursor.fetchall()
+    
+    def upcoming_payments(self, today, limit=5):
+        """Earliest upcoming (date, name, amount, kind) payments from today on"""
+        # Recurring payments fall on this month's payment day, or next month's
+        # once they have a history entry for this month
+        next_month = month_bounds(today.year, today.month)[1]
+        cursor = self.get_connection().execute("""
+            SELECT due_date, name, amount, kind
+            FROM (
+                SELECT CASE WHEN EXISTS (
+                           SELECT 1 FROM payment_history ph
+                           WHERE ph.payment_type = 'recurring' AND ph.month = ? AND ph.year = ?
+                             AND ph.payment_id = rp.id
+                       )
+                       THEN printf('%s-%02d', ?, MIN(CAST(payment_day AS INTEGER), ?))
+                       ELSE printf('%s-%02d', ?, MIN(CAST(payment_day AS INTEGER), ?))
+                       END AS due_date,
+                       name, amount, 'Recurring' AS kind
+                FROM recurring_payments rp
+                WHERE COALESCE(is_active, 1) = 1
+                UNION ALL
+                SELECT payment_date, name, amount, 'One-Time'
+                FROM one_time_payments
+                WHERE paid = 0 AND payment_date >= ?
+            )
+            WHERE due_date >= ?
+            ORDER BY due_date
+            LIMIT ?
+        """, (
+            today.month, today.year,
+            next_month.strftime("%Y-%m"), last_day_of_month(next_month.year, next_month.month).day,
+            today.strftime("%Y-%m"), last_day_of_month(today.year, today.month).day,
+            today.isoformat(), today.isoformat(), limit,
+        ))
+        return [(parse_date(due_date), name, amount, kind)
+                for due_date, name, amount, kind in cursor.fetchall()]
+    
+    def write_month_summaries(self, cursor, months, savings=None):
+        """Recompute the monthly_summary rows for a set of (month, year) pairs in one statement; the caller commits
+        
+        savings optionally maps (month, year) to a new savings amount to store in
+        the same write; other months keep the amount they have. Returns the
+        (month, year, total_payments, total_income, savings_amount, net_savings)
+        rows written; months whose summary was already up to date are left
+        untouched and not returned.
+        """
+        months = list(months)
+        if not months:
+            return []
+        savings = savings or {}
+        today = datetime.today().date()
+        
+        # For current month: show all scheduled recurring income (not just received);
+        # for past months: show only what was actually received
+        current_income = self.scheduled_income_total() if (today.month, today.year) in months else 0
+        
+        values = ", ".join("(?, ?, ?)" for _ in months)
+        params = [value for month, year in months for value in (month, year, savings.get((month, year)))]
+        # Upsert rather than INSERT OR REPLACE, so existing rows are updated in
+        # place instead of deleted and re-inserted. Months whose stored summary
+        # already matches are filtered out before the insert: even a skipped
+        # conflict would bump sqlite_sequence, and an empty write keeps the
+        # database mtimes the caches are keyed on unchanged
+        cursor.execute(f"""
+            INSERT INTO monthly_summary 
+            (month, year, total_payments, total_income, savings_amount, net_savings,
+             received_income, credit_paid, debit_paid, updated_at)
+            SELECT month, year, credit_paid + debit_paid, total_income, savings,
+                   total_income - (credit_paid + debit_paid) - savings,
+                   received_income, credit_paid, debit_paid, CURRENT_TIMESTAMP
+            FROM (
+                WITH months(month, year, savings) AS (VALUES {values}),
+                totals AS (
+                    SELECT ph.month, ph.year,
+                           SUM(CASE WHEN ph.effective_type = 'income' THEN ph.amount ELSE 0 END) AS received_income,
+                           SUM(CASE WHEN ph.effective_type = 'credit' THEN ph.amount ELSE 0 END) AS credit_paid,
+                           SUM(CASE WHEN ph.effective_type = 'debit' THEN ph.amount ELSE 0 END) AS debit_paid
+                    FROM payment_history ph
+                    JOIN months m ON ph.month = m.month AND ph.year = m.year
+                    WHERE ph.payment_type IN ('income', 'recurring', 'one_time')
+                    GROUP BY ph.month, ph.year
+                )
+                SELECT m.month, m.year,
+                       COALESCE(t.received_income, 0) AS received_income,
+                       COALESCE(t.credit_paid, 0) AS credit_paid,
+                       COALESCE(t.debit_paid, 0) AS debit_paid,
+                       CASE WHEN m.month = ? AND m.year = ? THEN ? ELSE COALESCE(t.received_income, 0) END AS total_income,
+                       COALESCE(m.savings, ms.savings_amount, 0) AS savings,
+                       ms.id AS summary_id, ms.total_payments AS stored_payments,
+                       ms.total_income AS stored_income, ms.savings_amount AS stored_savings,
+                       ms.net_savings AS stored_net, ms.received_income AS stored_received,
+                       ms.credit_paid AS stored_credit, ms.debit_paid AS stored_debit
+                FROM months m
+                LEFT JOIN totals t ON t.month = m.month AND t.year = m.year
+                LEFT JOIN monthly_summary ms ON ms.month = m.month AND ms.year = m.year
+            )
+            WHERE summary_id IS NULL
+               OR (stored_payments, stored_income, stored_savings, stored_net,
+                   stored_received, stored_credit, stored_debit)
+                  IS NOT (credit_paid + debit_paid, total_income, savings,
+                          total_income - (credit_paid + debit_paid) - savings,
+                          received_income, credit_paid, debit_paid)
+            ON CONFLICT(month, year) DO UPDATE SET
+                total_payments = excluded.total_payments,
+                total_income = excluded.total_income,
+                savings_amount = excluded.savings_amount,
+                net_savings = excluded.net_savings,
+                received_income = excluded.received_income,
+                credit_paid = excluded.credit_paid,
+                debit_paid = excluded.debit_paid,
+                updated_at = excluded.updated_at
+            RETURNING month, year, total_payments, total_income, savings_amount, net_savings
+        """, params + [today.month, today.year, current_income])
+        return cursor.fetchall()
+
+class DbTaskSignals(QObject):
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+class DbTask(QRunnable):
+    """Run a database function on the thread pool and report back on the GUI thread"""
+    def __init__(self, fn, *args, cb=None, err):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = DbTaskSignals()
+        if cb is not None:
+            self.signals.done.connect(cb)
+        self.signals.failed.connect(err)
+    
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.done.emit(result)
+
+class RowsModel(QAbstractTableModel):
+    """Read-only table model over a list of row tuples
+    
+    formats maps a column to a function turning its raw value into display
+    text, so only the cells the view actually paints get formatted.
+    """
+    page_size = 200
+    # One brush per color, shared by every model and handed out on each repaint
+    brushes = {}
+    
+    def __init__(self, headers, parent=None, formats=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.formats = formats or {}
+        self.rows = []
+        self.colors = {}
+        self.records = []
+        self.total_count = 0
+        self.fetch_page = None
+    
+    def set_rows(self, rows, colors=None, records=None):
+        """Replace the contents; colors maps (row, column) to a foreground color"""
+        colors = colors or {}
+        records = records or []
+        if self.fetch_page is None and (rows, colors, records) == (self.rows, self.colors, self.records):
+            # Nothing changed; skip the reset so the view keeps its selection
+            # and doesn't re-query every visible cell
+            return
+        self.beginResetModel()
+        self.rows = rows
+        self.colors = colors
+        self.records = records
+        self.total_count = len(rows)
+        self.fetch_page = None
+        self.endResetModel()
+    
+    def set_paged(self, total_count, fetch_page):
+        """Replace the contents with rows loaded a page at a time as the view scrolls
+        
+        fetch_page(offset, limit) returns (rows, colors, records) for that slice,
+        with colors keyed by absolute row index.
+        """
+        self.beginResetModel()
+        self.total_count = total_count
+        self.fetch_page = fetch_page
+        self.rows, self.colors, self.records = fetch_page(0, self.page_size)
+        self.endResetModel()
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetch_page is not None and len(self.rows) < self.total_count
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        start = len(self.rows)
+        rows, colors, records = self.fetch_page(start, self.page_size)
+        if not rows:
+            # Rows were removed since the count was taken
+            self.total_count = start
+            return
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self.rows.extend(rows)
+        self.colors.update(colors)
+        self.records.extend(records)
+        self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self.rows[index.row()][index.column()]
+            fmt = self.formats.get(index.column())
+            return value if fmt is None else fmt(value)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            color = self.colors.get((index.row(), index.column()))
+            if color is None:
+                return None
+            brush = self.brushes.get(color)
+            if brush is None:
+                brush = self.brushes[color] = QBrush(QColor(color))
+            return brush
+        if role == Qt.ItemDataRole.UserRole and index.row() < len(self.records):
+            return self.records[index.row()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Paints a push button in every cell of a column and reports clicks on it"""
+    clicked = pyqtSignal(QModelIndex)
+    
+    def __init__(self, text, parent=None):
+        super().__init__(parent)
+        self.text = text
+    
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = self.text
+        button.state = QStyle.StateFlag.State_Enabled
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+    
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())):
+            self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
 
 class PaymentDialog(QDialog):
     def __init__(self, parent=None, payment_data=None):
@@ -180,18 +1000,6 @@ class PaymentDialog(QDialog):
         self.setModal(True)
         self.resize(400, 300)
         
-        # Apply modern styling
-        self.setStyleSheet("""
-            QDialog {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1a1a2e, stop:1 #16213e);
-            }
-            QLabel {
-                color: #ffffff;
-                font-weight: bold;
-            }
-        """)
-        
         layout = QFormLayout()
         
         self.name_edit = QLineEdit()
@@ -239,15 +1047,11 @@ class PaymentDialog(QDialog):
         layout.addRow("Pay Period:", period_widget)
         
         if payment_data:
-            self.name_edit.setText(payment_data[1])
-            self.amount_spin.setValue(payment_data[2])
-            self.day_spin.setValue(payment_data[3])
-            # Handle payment_type (may not exist in old data)
-            if len(payment_data) > 5:
-                payment_type = payment_data[5] if payment_data[5] else 'debit'
-            else:
-                payment_type = 'debit'
-            if payment_type.lower() == 'credit':
+            self.name_edit.setText(payment_data["name"])
+            self.amount_spin.setValue(payment_data["amount"])
+            self.day_spin.setValue(payment_data["payment_day"])
+            payment_type = (payment_data["payment_type"] or 'debit').lower()
+            if payment_type == 'credit':
                 self.type_combo.setCurrentIndex(1)
             else:
                 self.type_combo.setCurrentIndex(0)
@@ -284,18 +1088,6 @@ class IncomeDialog(QDialog):
         self.setModal(True)
         self.resize(400, 250)
         
-        # Apply modern styling
-        self.setStyleSheet("""
-            QDialog {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1a1a2e, stop:1 #16213e);
-            }
-            QLabel {
-                color: #ffffff;
-                font-weight: bold;
-            }
-        """)
-        
         layout = QFormLayout()
         
         self.name_edit = QLineEdit()
@@ -316,9 +1108,9 @@ class IncomeDialog(QDialog):
         layout.addRow("Income Day:", self.day_spin)
         
         if income_data:
-            self.name_edit.setText(income_data[1])
-            self.amount_spin.setValue(income_data[2])
-            self.day_spin.setValue(income_data[3])
+            self.name_edit.setText(income_data["name"])
+            self.amount_spin.setValue(income_data["amount"])
+            self.day_spin.setValue(income_data["income_day"])
         
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         buttons.accepted.connect(self.accept)
@@ -342,18 +1134,6 @@ class OneTimePaymentDialog(QDialog):
         self.setModal(True)
         self.resize(400, 250)
         
-        # Apply modern styling
-        self.setStyleSheet("""
-            QDialog {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1a1a2e, stop:1 #16213e);
-            }
-            QLabel {
-                color: #ffffff;
-                font-weight: bold;
-            }
-        """)
-        
         layout = QFormLayout()
         
         self.name_edit = QLineEdit()
@@ -372,10 +1152,9 @@ class OneTimePaymentDialog(QDialog):
         layout.addRow("Payment Date:", self.date_edit)
         
         if payment_data:
-            self.name_edit.setText(payment_data[1])
-            self.amount_spin.setValue(payment_data[2])
-            date = datetime.strptime(payment_data[3], "%Y-%m-%d").date()
-            self.date_edit.setDate(QDate(date.year, date.month, date.day))
+            self.name_edit.setText(payment_data["name"])
+            self.amount_spin.setValue(payment_data["amount"])
+            self.date_edit.setDate(iso_to_qdate(payment_data["payment_date"]))
         
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         buttons.accepted.connect(self.accept)
@@ -388,221 +1167,48 @@ class OneTimePaymentDialog(QDialog):
         return {
             'name': self.name_edit.text().strip(),
             'amount': self.amount_spin.value(),
-            'payment_date': self.date_edit.date().toString("yyyy-MM-dd")
+            'payment_date': qdate_to_iso(self.date_edit.date())
         }
 
 class FinanceApp(QMainWindow):
+    # Order the queued views are reloaded in
+    refresh_order = (
+        'load_recurring_payments', 'load_recurring_income', 'load_one_time_payments',
+        'load_history', 'load_summary',
+    )
+    
     def __init__(self):
         super().__init__()
         self.db = Database()
+        # Background database work runs on one worker thread that never
+        # expires; every thread keeps its own connection until exit, so a pool
+        # that retires idle threads would leave one open per retired thread
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.pool.setExpiryTimeout(-1)
         self.setWindowTitle("Finance Tracker")
         self.resize(1400, 900)
         
-        # Set modern dark theme with enhanced styling
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                color: #ffffff;
-            }
-            QWidget {
-                background: transparent;
-                color: #ffffff;
-            }
-            QGroupBox {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2d3748, stop:1 #1a202c);
-                border: 2px solid #4a5568;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-                color: #ffffff;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 5px 10px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                border-radius: 5px;
-                color: #ffffff;
-                font-weight: bold;
-            }
-            QTableWidget {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2d3748, stop:1 #1a202c);
-                color: #ffffff;
-                gridline-color: #4a5568;
-                border: 2px solid #4a5568;
-                border-radius: 8px;
-                selection-background-color: #667eea;
-                selection-color: #ffffff;
-            }
-            QTableWidget::item {
-                background-color: transparent;
-                color: #ffffff;
-                padding: 5px;
-            }
-            QTableWidget::item:selected {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                color: #ffffff;
-            }
-            QTableWidget::item:hover {
-                background-color: #4a5568;
-            }
-            QHeaderView::section {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                color: #ffffff;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }
-            QTabWidget::pane {
-                border: 2px solid #4a5568;
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1a1a2e, stop:1 #16213e);
-                border-radius: 8px;
-            }
-            QTabBar::tab {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2d3748, stop:1 #1a202c);
-                color: #a0aec0;
-                padding: 10px 20px;
-                margin-right: 3px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                border: 1px solid #4a5568;
-                font-weight: bold;
-            }
-            QTabBar::tab:selected {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                color: #ffffff;
-                border-bottom: 2px solid #667eea;
-            }
-            QTabBar::tab:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #3d4758, stop:1 #2a3448);
-                color: #ffffff;
-            }
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                color: #ffffff;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 11pt;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #7c8bf0, stop:1 #8a5fb8);
-                transform: scale(1.05);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #5568d9, stop:1 #6a3a92);
-            }
-            QLineEdit, QDoubleSpinBox, QDateEdit {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2d3748, stop:1 #1a202c);
-                color: #ffffff;
-                border: 2px solid #4a5568;
-                border-radius: 6px;
-                padding: 6px;
-                selection-background-color: #667eea;
-            }
-            QLineEdit:focus, QDoubleSpinBox:focus, QDateEdit:focus {
-                border: 2px solid #667eea;
-            }
-            QComboBox {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2d3748, stop:1 #1a202c);
-                color: #ffffff;
-                border: 2px solid #4a5568;
-                border-radius: 6px;
-                padding: 5px;
-            }
-            QComboBox:hover {
-                border: 2px solid #667eea;
-            }
-            QComboBox::drop-down {
-                border: none;
-                background: transparent;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #ffffff;
-                margin-right: 5px;
-            }
-            QComboBox QAbstractItemView {
-                background: #2d3748;
-                border: 2px solid #667eea;
-                border-radius: 6px;
-                selection-background-color: #667eea;
-                selection-color: #ffffff;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QScrollBar:vertical {
-                background: #2d3748;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                min-height: 20px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #7c8bf0, stop:1 #8a5fb8);
-            }
-            QScrollBar:horizontal {
-                background: #2d3748;
-                height: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:horizontal {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                min-width: 20px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #7c8bf0, stop:1 #8a5fb8);
-            }
-            QMessageBox {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1a1a2e, stop:1 #16213e);
-            }
-            QMessageBox QLabel {
-                color: #ffffff;
-            }
-            QMessageBox QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #667eea, stop:1 #764ba2);
-                color: #ffffff;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            QMessageBox QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #7c8bf0, stop:1 #8a5fb8);
-            }
-        """)
+        # Summary tab numbers keyed by (day, database mtimes), cleared on every write
+        self.summary_cache = {}
+        # Sign of the net savings last shown, so its style sheet is only set on change
+        self.net_savings_positive = None
+        # Summary computation running on the thread pool, and whether another
+        # refresh was requested meanwhile
+        self.summary_in_flight = False
+        self.summary_stale = False
+        # (day, summary) currently on screen
+        self.shown_summary = None
+        # (year, month) the pending-deletion check last ran for in this process
+        self.last_deletion_check = None
+        # recent_transactions rows written in this session, newest last, so undo
+        # doesn't have to query for them
+        self.recent_transactions = deque(maxlen=50)
+        # ((month, year, database mtimes), per-day totals) last shown on the calendar
+        self.calendar_totals = None
+        # Names of the load_* methods queued by schedule_refresh for the next
+        # event loop pass
+        self.pending_refresh = set()
         
         # Create tabs
         self.tabs = QTabWidget()
@@ -623,13 +1229,16 @@ class FinanceApp(QMainWindow):
         self.one_time_payments_tab = self.create_one_time_payments_tab()
         self.tabs.addTab(self.one_time_payments_tab, "One-Time Payments")
         
-        # History Tab
-        self.history_tab = self.create_history_tab()
-        self.tabs.addTab(self.history_tab, "History")
-        
-        # Calendar Tab
-        self.calendar_tab = self.create_calendar_tab()
-        self.tabs.addTab(self.calendar_tab, "📅 Calendar")
+        # History and Calendar Tabs start as placeholders and are built the
+        # first time they are opened
+        self.history_tab = None
+        self.history_table = None
+        self.calendar_tab = None
+        self.lazy_tabs = {
+            self.tabs.addTab(QWidget(), "History"): (self.create_history_tab, 'history_tab'),
+            self.tabs.addTab(QWidget(), "📅 Calendar"): (self.create_calendar_tab, 'calendar_tab'),
+        }
+        self.tabs.currentChanged.connect(self.ensure_tab_built)
         
         # Main layout
         main_widget = QWidget()
@@ -641,18 +1250,57 @@ class FinanceApp(QMainWindow):
         # Auto-update on startup
         self.update_payment_dates()
         
-        # Check and disable expired payments
-        self.check_and_disable_expired_payments()
-        
-        # Check and delete payments marked for deletion next month
-        self.check_and_delete_pending_deletions()
+        # Disable expired payments and delete payments marked for deletion next
+        # month in the background so the window shows up straight away
+        self.pool.start(DbTask(
+            self.run_startup_checks,
+            cb=self.on_startup_checks_done,
+            err=self.on_startup_checks_failed,
+        ))
+    
+    def commit_changes(self, conn):
+        """Commit a write and drop the cached summary and calendar numbers"""
+        conn.commit()
+        self.summary_cache.clear()
+        self.calendar_totals = None
+    
+    def schedule_refresh(self, *names):
+        """Reload the named views once, after the current event has been handled"""
+        if not self.pending_refresh:
+            QTimer.singleShot(0, self.run_pending_refresh)
+        self.pending_refresh.update(names)
+    
+    def run_pending_refresh(self):
+        pending, self.pending_refresh = self.pending_refresh, set()
+        for name in self.refresh_order:
+            if name in pending:
+                getattr(self, name)()
+    
+    def ensure_tab_built(self, index):
+        """Replace a placeholder tab with the real one the first time it is shown"""
+        if index not in self.lazy_tabs:
+            return
+        factory, attr = self.lazy_tabs.pop(index)
+        label = self.tabs.tabText(index)
+        placeholder = self.tabs.widget(index)
+        widget = factory()
+        setattr(self, attr, widget)
+        
+        # Swapping the current tab would re-enter this handler
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, widget, label)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
     
     def create_summary_tab(self):
         widget = QWidget()
         layout = QVBoxLayout()
         
         # Title
-        title_label = QLabel(f"<h1 style='color: #ffffff; text-align: center;'>📊 Financial Summary - {datetime.today().strftime('%B %Y')}</h1>")
+        today = datetime.today().date()
+        title_label = QLabel(f"<h1 style='color: #ffffff; text-align: center;'>📊 Financial Summary - {month_label(today.month, today.year)}</h1>")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title_label.setStyleSheet("""
             background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
@@ -809,14 +1457,9 @@ class FinanceApp(QMainWindow):
         next_payments_box = QGroupBox("📅 Next 5 Scheduled Payments")
         next_payments_layout = QVBoxLayout()
         
-        self.next_payments_table = QTableWidget()
-        self.next_payments_table.setColumnCount(4)
-        self.next_payments_table.setHorizontalHeaderLabels([
+        self.next_payments_table = self.create_table_view([
             "Date", "Name", "Amount", "Type"
-        ])
-        self.next_payments_table.horizontalHeader().setStretchLastSection(True)
-        self.next_payments_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.next_payments_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        ], {0: display_date, 2: gbp})
         self.next_payments_table.setMaximumHeight(200)
         
         next_payments_layout.addWidget(self.next_payments_table)
@@ -832,255 +1475,245 @@ class FinanceApp(QMainWindow):
     def load_summary(self):
         """Load and display summary information"""
         today = datetime.today().date()
-        current_month = today.month
-        current_year = today.year
         
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        # Totals only change when data is written; commit_changes() clears the
+        # cache and the file mtimes catch writes from other processes
+        key = (today, self.db.data_stamp())
+        summary = self.summary_cache.get(key)
+        if summary is not None:
+            self.apply_summary(summary, today)
+            return
+        
+        # Compute on the thread pool so the queries never stall the GUI. A
+        # request made while one is running just marks its result as stale
+        if self.summary_in_flight:
+            self.summary_stale = True
+            return
+        self.summary_in_flight = True
+        self.summary_stale = False
+        self.pool.start(DbTask(
+            self.compute_summary, today,
+            cb=lambda summary: self.on_summary_computed(key, today, summary),
+            err=self.on_summary_failed,
+        ))
+    
+    def on_summary_computed(self, key, today, summary):
+        self.summary_in_flight = False
+        if self.summary_stale:
+            # Data changed while computing; start over with a fresh snapshot
+            self.load_summary()
+            return
+        
+        self.summary_cache.clear()
+        self.summary_cache[key] = summary
+        self.apply_summary(summary, today)
+    
+    def on_summary_failed(self, error):
+        self.summary_in_flight = False
+        self.show_summary_error(error)
+    
+    def apply_summary(self, summary, today):
+        """Show computed summary numbers in the Summary tab"""
+        # Tab switches and no-op refreshes hand back the same numbers; leave
+        # the labels and next payments table alone in that case
+        if (today, summary) == self.shown_summary:
+            return
         
         try:
-            # 1. Income coming in for this month (from recurring income)
-            cursor.execute("SELECT amount FROM recurring_income")
-            recurring_income_list = cursor.fetchall()
-            total_income = sum(income[0] for income in recurring_income_list) if recurring_income_list else 0
-            
-            # Also check if income was already received this month
-            cursor.execute("""
-                SELECT COALESCE(SUM(amount), 0) FROM payment_history
-                WHERE payment_type = 'income' AND month = ? AND year = ?
-            """, (current_month, current_year))
-            received_income = cursor.fetchone()[0] or 0
-            
-            # 2. Money coming out (total scheduled payments - recurring + one-time for this month)
-            # Separate credit and debit (only active payments)
-            cursor.execute("SELECT amount, payment_type FROM recurring_payments WHERE COALESCE(is_active, 1) = 1")
-            recurring_payments_list = cursor.fetchall()
-            total_recurring = 0
-            total_credit = 0
-            total_debit = 0
-            
-            for payment in recurring_payments_list:
-                amount = payment[0]
-                payment_type = payment[1] if len(payment) > 1 and payment[1] else 'debit'
-                total_recurring += amount
-                if payment_type and payment_type.lower() == 'credit':
-                    total_credit += amount
-                else:
-                    total_debit += amount
-            
-            # One-time payments for this month (count as debit)
-            cursor.execute("""
-                SELECT COALESCE(SUM(amount), 0) FROM one_time_payments
-                WHERE strftime('%m', payment_date) = ? AND strftime('%Y', payment_date) = ?
-            """, (f"{current_month:02d}", str(current_year)))
-            one_time_total = cursor.fetchone()[0] or 0
-            total_debit += one_time_total  # One-time payments are debit
-            
-            total_money_out = total_recurring + one_time_total
-            
-            # 3. Money already paid from scheduled payments this month
-            # Separate by credit/debit
-            cursor.execute("""
-                SELECT ph.amount, ph.payment_id, ph.payment_type as hist_type, rp.payment_type
-                FROM payment_history ph
-                LEFT JOIN recurring_payments rp ON ph.payment_id = rp.id AND ph.payment_type = 'recurring'
-                WHERE ph.payment_type IN ('recurring', 'one_time') AND ph.month = ? AND ph.year = ?
-            """, (current_month, current_year))
-            paid_payments = cursor.fetchall()
-            
-            already_paid = 0
-            credit_paid = 0
-            debit_paid = 0
-            
-            for paid in paid_payments:
-                amount = paid[0]
-                hist_type = paid[2]  # payment_type from payment_history
-                payment_type = paid[3] if len(paid) > 3 and paid[3] else 'debit'
-                
-                # If it's a one_time payment, it's always debit
-                if hist_type == 'one_time':
-                    payment_type = 'debit'
-                
-                already_paid += amount
-                if payment_type and payment_type.lower() == 'credit':
-                    credit_paid += amount
-                else:
-                    debit_paid += amount
-            
-            # 4. Money to be paid (total scheduled - already paid)
-            to_be_paid = total_money_out - already_paid
-            remaining_credit = total_credit - credit_paid
-            remaining_debit = total_debit - debit_paid
-            
-            # 5. Next 5 scheduled payments
-            all_upcoming_payments = []
-            
-            # Get recurring payments with their next payment dates (only active)
-            cursor.execute("""
-                SELECT id, name, amount, payment_day, 
-                       COALESCE(payment_type, 'debit') as payment_type,
-                       last_paid_date 
-                FROM recurring_payments
-                WHERE COALESCE(is_active, 1) = 1
-            """)
-            recurring_payments = cursor.fetchall()
-            
-            for payment in recurring_payments:
-                payment_id, name, amount, payment_day, payment_type, last_paid_date = payment
-                # Calculate next payment date
-                last_month_date, this_month_date, next_month_date = self.calculate_payment_dates(
-                    payment_day, last_paid_date, current_month, current_year
-                )
-                
-                # Check if already paid this month
-                cursor.execute("""
-                    SELECT COUNT(*) FROM payment_history
-                    WHERE payment_id = ? AND payment_type = 'recurring'
-                    AND month = ? AND year = ?
-                """, (payment_id, current_month, current_year))
-                
-                if cursor.fetchone()[0] == 0:
-                    # Not paid this month, use this month's date
-                    if this_month_date >= today:
-                        all_upcoming_payments.append((this_month_date, name, amount, "Recurring"))
-                else:
-                    # Already paid, use next month's date
-                    all_upcoming_payments.append((next_month_date, name, amount, "Recurring"))
-            
-            # Get one-time payments that are unpaid and upcoming
-            cursor.execute("""
-                SELECT id, name, amount, payment_date FROM one_time_payments
-                WHERE paid = 0 AND payment_date >= date('now')
-                ORDER BY payment_date
-            """)
-            one_time_payments = cursor.fetchall()
-            
-            for payment_id, name, amount, payment_date_str in one_time_payments:
-                payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d").date()
-                all_upcoming_payments.append((payment_date, name, amount, "One-Time"))
-            
-            # Sort by date and take next 5
-            all_upcoming_payments.sort(key=lambda x: x[0])
-            next_5_payments = all_upcoming_payments[:5]
-            
-            # 6. Get savings amount for this month
-            cursor.execute("""
-                SELECT savings_amount FROM monthly_summary
-                WHERE month = ? AND year = ?
-            """, (current_month, current_year))
-            savings_result = cursor.fetchone()
-            savings_amount = savings_result[0] if savings_result and savings_result[0] else 0
-            
-            # Calculate net savings: Income - Payments - Savings
-            net_savings = total_income - total_money_out - savings_amount
-            
-            conn.close()
+            total_income = summary['total_income']
+            received_income = summary['received_income']
+            total_money_out = summary['total_money_out']
+            already_paid = summary['already_paid']
+            to_be_paid = summary['to_be_paid']
+            total_credit = summary['total_credit']
+            total_debit = summary['total_debit']
+            remaining_credit = summary['remaining_credit']
+            remaining_debit = summary['remaining_debit']
+            net_savings = summary['net_savings']
+            next_5_payments = summary['next_5_payments']
             
             # Update labels
-            self.income_label.setText(f"£{total_income:,.2f}\n(Received: £{received_income:,.2f})")
-            self.money_out_label.setText(f"£{total_money_out:,.2f}")
-            self.paid_label.setText(f"£{already_paid:,.2f}")
-            self.to_pay_label.setText(f"£{to_be_paid:,.2f}")
-            self.remaining_credit_label.setText(f"£{remaining_credit:,.2f}\n(Scheduled: £{total_credit:,.2f})")
-            self.remaining_debit_label.setText(f"£{remaining_debit:,.2f}\n(Scheduled: £{total_debit:,.2f})")
-            
-            # Update net savings label with color coding and enhanced styling
-            if net_savings >= 0:
-                self.net_savings_label.setText(f"£{net_savings:,.2f}")
-                self.net_savings_label.setStyleSheet("""
-                    color: #48bb78;
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 rgba(72, 187, 120, 0.3), stop:1 rgba(72, 187, 120, 0.1));
-                    border: 2px solid #48bb78;
-                    border-radius: 10px;
-                    padding: 15px;
-                """)
+            self.income_label.setText(f"{gbp(total_income)}\n(Received: {gbp(received_income)})")
+            self.money_out_label.setText(gbp(total_money_out))
+            self.paid_label.setText(gbp(already_paid))
+            self.to_pay_label.setText(gbp(to_be_paid))
+            self.remaining_credit_label.setText(f"{gbp(remaining_credit)}\n(Scheduled: {gbp(total_credit)})")
+            self.remaining_debit_label.setText(f"{gbp(remaining_debit)}\n(Scheduled: {gbp(total_debit)})")
+            
+            # Update net savings label with color coding and enhanced styling.
+            # Re-applying a style sheet makes Qt re-parse it and re-polish the
+            # label, so only do it when the sign actually changes
+            saving = net_savings >= 0
+            if saving:
+                self.net_savings_label.setText(gbp(net_savings))
             else:
-                self.net_savings_label.setText(f"-£{abs(net_savings):,.2f}")
-                self.net_savings_label.setStyleSheet("""
-                    color: #f56565;
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 rgba(245, 101, 101, 0.3), stop:1 rgba(245, 101, 101, 0.1));
-                    border: 2px solid #f56565;
-                    border-radius: 10px;
-                    padding: 15px;
-                """)
+                self.net_savings_label.setText(f"-{gbp(abs(net_savings))}")
+            if saving != self.net_savings_positive:
+                self.net_savings_label.setStyleSheet(NET_SAVINGS_POSITIVE_QSS if saving else NET_SAVINGS_NEGATIVE_QSS)
+                self.net_savings_positive = saving
+            
+            # Update next payments table with a single model reset
+            rows = [
+                (payment_date, name, amount, ptype)
+                for payment_date, name, amount, ptype in next_5_payments
+            ]
+            # Highlight if due today or overdue
+            colors = {
+                (row_idx, col): Qt.GlobalColor.yellow
+                for row_idx, (payment_date, _, _, _) in enumerate(next_5_payments)
+                if payment_date <= today
+                for col in range(4)
+            }
+            with batched(self.next_payments_table):
+                self.next_payments_table.model().set_rows(rows, colors)
             
-            # Update next payments table
-            self.next_payments_table.setRowCount(len(next_5_payments))
-            for row_idx, (payment_date, name, amount, ptype) in enumerate(next_5_payments):
-                self.next_payments_table.setItem(row_idx, 0, QTableWidgetItem(payment_date.strftime("%d/%m/%Y")))
-                self.next_payments_table.setItem(row_idx, 1, QTableWidgetItem(name))
-                self.next_payments_table.setItem(row_idx, 2, QTableWidgetItem(f"£{amount:,.2f}"))
-                self.next_payments_table.setItem(row_idx, 3, QTableWidgetItem(ptype))
-                
-                # Highlight if due today or overdue
-                if payment_date <= today:
-                    for col in range(4):
-                        item = self.next_payments_table.item(row_idx, col)
-                        if item:
-                            item.setForeground(Qt.GlobalColor.yellow)
+            self.shown_summary = (today, summary)
         
         except Exception as e:
-            conn.close()
-            print(f"Error loading summary: {e}")
-            self.income_label.setText("Error loading data")
-            self.money_out_label.setText("Error loading data")
-            self.paid_label.setText("Error loading data")
-            self.to_pay_label.setText("Error loading data")
-            self.remaining_credit_label.setText("Error loading data")
-            self.remaining_debit_label.setText("Error loading data")
-            self.net_savings_label.setText("Error loading data")
-            self.net_savings_label.setStyleSheet("color: #FF5722;")
+            self.show_summary_error(e)
     
-    def test_notification(self):
-        """Test the notification service"""
-        import subprocess
-        import os
+    def show_summary_error(self, error):
+        print(f"Error loading summary: {error}")
+        self.income_label.setText("Error loading data")
+        self.money_out_label.setText("Error loading data")
+        self.paid_label.setText("Error loading data")
+        self.to_pay_label.setText("Error loading data")
+        self.remaining_credit_label.setText("Error loading data")
+        self.remaining_debit_label.setText("Error loading data")
+        self.net_savings_label.setText("Error loading data")
+        self.net_savings_label.setStyleSheet("color: #FF5722;")
+        self.net_savings_positive = None
+        self.shown_summary = None
+    
+    def compute_summary(self, today):
+        """Compute the Summary tab totals and next payments for the given day"""
+        current_month = today.month
+        current_year = today.year
         
-        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "notification_service.py")
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
         
-        if not os.path.exists(script_path):
-            QMessageBox.warning(
-                self, 
-                "Notification Service Not Found",
-                f"Could not find notification_service.py at:\n{script_path}\n\nPlease make sure the file exists."
-            )
-            return
+        # Paid/received totals and savings are kept on this month's monthly_summary row
+        cursor.execute("""
+            SELECT received_income, credit_paid, debit_paid, savings_amount
+            FROM monthly_summary
+            WHERE month = ? AND year = ?
+        """, (current_month, current_year))
+        month_row = cursor.fetchone()
+        
+        if month_row:
+            received_income, credit_paid, debit_paid, savings_amount = (value or 0 for value in month_row)
+        else:
+            # Nothing recorded for this month yet
+            history_totals = self.db.month_history_totals(current_month, current_year)
+            received_income = history_totals.get('income', 0)
+            credit_paid = history_totals.get('credit', 0)
+            debit_paid = history_totals.get('debit', 0)
+            savings_amount = 0
+        
+        # Scheduled sums are computed by SQLite in a single query
+        scheduled_totals = self.db.scheduled_month_totals(current_month, current_year)
+        
+        # 1. Income coming in for this month (from recurring income)
+        total_income = scheduled_totals.get('income', 0)
+        
+        # 2. Money coming out (total scheduled payments - recurring + one-time for this month)
+        # Separate credit and debit (only active payments)
+        total_credit = scheduled_totals.get('credit', 0)
+        total_debit = scheduled_totals.get('debit', 0)
+        total_recurring = total_credit + total_debit
+        
+        # One-time payments for this month (count as debit)
+        one_time_total = scheduled_totals.get('one_time', 0)
+        total_debit += one_time_total  # One-time payments are debit
+        
+        total_money_out = total_recurring + one_time_total
+        
+        # 3. Money already paid from scheduled payments this month
+        # Separate by credit/debit (one-time payments are always debit)
+        already_paid = credit_paid + debit_paid
+        
+        # 4. Money to be paid (total scheduled - already paid)
+        to_be_paid = total_money_out - already_paid
+        remaining_credit = total_credit - credit_paid
+        remaining_debit = total_debit - debit_paid
+        
+        # 5. Next 5 scheduled payments, picked and ordered by SQLite
+        next_5_payments = self.db.upcoming_payments(today)
+        
+        # 6. Calculate net savings: Income - Payments - Savings
+        net_savings = total_income - total_money_out - savings_amount
+        
+        return {
+            'total_income': total_income,
+            'received_income': received_income,
+            'total_money_out': total_money_out,
+            'already_paid': already_paid,
+            'to_be_paid': to_be_paid,
+            'total_credit': total_credit,
+            'total_debit': total_debit,
+            'remaining_credit': remaining_credit,
+            'remaining_debit': remaining_debit,
+            'net_savings': net_savings,
+            'next_5_payments': next_5_payments,
+        }
+    
+    def test_notification(self):
+        """Test the notification service"""
+        # Run the service in-process on the worker thread instead of spawning a
+        # new interpreter, so the window stays responsive while it runs
+        self.pool.start(DbTask(
+            self.run_notification_service,
+            cb=self.on_notification_sent,
+            err=self.on_notification_failed,
+        ))
+    
+    def run_notification_service(self):
+        """Send the daily notifications (runs on a worker thread)"""
+        import notification_service
         
         try:
-            # Run the notification service
-            result = subprocess.run(
-                ["python3", script_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                QMessageBox.information(
-                    self,
-                    "Notification Sent",
-                    "Test notifications have been sent!\n\nCheck your macOS notifications to see them."
-                )
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Notification Error",
-                    f"Notification service returned an error:\n\n{result.stderr}\n\nCheck the notification_error.log file for details."
-                )
-        except subprocess.TimeoutExpired:
-            QMessageBox.warning(
-                self,
-                "Timeout",
-                "The notification service took too long to run."
-            )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Failed to run notification service:\n\n{str(e)}"
-            )
+            # A list of our own for the osascript fallbacks, rather than any
+            # state shared with other runs of the module
+            notification_service.main([])
+        except SystemExit as e:
+            # main() exits with a non-zero code after reporting an error
+            if e.code:
+                raise RuntimeError(f"Notification service exited with code {e.code}")
+    
+    def reload_after_notification_run(self):
+        """Show what the notification run may have deleted or disabled"""
+        # It writes through its own connection; the caches are keyed on the
+        # database mtimes, but clear them like the startup checks do
+        self.summary_cache.clear()
+        self.calendar_totals = None
+        self.schedule_refresh('load_recurring_payments', 'load_summary')
+    
+    def on_notification_sent(self, _result):
+        self.reload_after_notification_run()
+        QMessageBox.information(
+            self,
+            "Notification Sent",
+            "Test notifications have been sent!\n\nCheck your macOS notifications to see them."
+        )
+    
+    def on_notification_failed(self, error):
+        # The checks commit one by one, so a later failure can follow real changes
+        self.reload_after_notification_run()
+        QMessageBox.warning(
+            self,
+            "Notification Error",
+            f"Notification service returned an error:\n\n{error}\n\nCheck your macOS notifications for details."
+        )
+    
+    def create_table_view(self, headers, formats=None):
+        """Create a read-only, row-selecting QTableView backed by a RowsModel"""
+        view = QTableView()
+        view.setModel(RowsModel(headers, view, formats))
+        view.horizontalHeader().setStretchLastSection(True)
+        view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        return view
     
     def create_recurring_payments_tab(self):
         widget = QWidget()
@@ -1116,14 +1749,9 @@ class FinanceApp(QMainWindow):
         button_layout.addStretch()
         
         # Table
-        self.recurring_payments_table = QTableWidget()
-        self.recurring_payments_table.setColumnCount(9)
-        self.recurring_payments_table.setHorizontalHeaderLabels([
+        self.recurring_payments_table = self.create_table_view([
             "ID", "Name", "Amount", "Type", "Payment Day", "Last Month", "This Month", "Next Month", "Status"
-        ])
-        self.recurring_payments_table.horizontalHeader().setStretchLastSection(True)
-        self.recurring_payments_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.recurring_payments_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        ], {0: str, 2: gbp, 5: display_date, 6: display_date, 7: display_date})
         
         layout.addLayout(button_layout)
         layout.addWidget(self.recurring_payments_table)
@@ -1157,14 +1785,9 @@ class FinanceApp(QMainWindow):
         button_layout.addStretch()
         
         # Table
-        self.recurring_income_table = QTableWidget()
-        self.recurring_income_table.setColumnCount(5)
-        self.recurring_income_table.setHorizontalHeaderLabels([
+        self.recurring_income_table = self.create_table_view([
             "ID", "Name", "Amount", "Income Day", "Last Received"
-        ])
-        self.recurring_income_table.horizontalHeader().setStretchLastSection(True)
-        self.recurring_income_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.recurring_income_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        ], {0: str, 2: gbp})
         
         layout.addLayout(button_layout)
         layout.addWidget(self.recurring_income_table)
@@ -1198,14 +1821,9 @@ class FinanceApp(QMainWindow):
         button_layout.addStretch()
         
         # Table
-        self.one_time_payments_table = QTableWidget()
-        self.one_time_payments_table.setColumnCount(5)
-        self.one_time_payments_table.setHorizontalHeaderLabels([
+        self.one_time_payments_table = self.create_table_view([
             "ID", "Name", "Amount", "Payment Date", "Status"
-        ])
-        self.one_time_payments_table.horizontalHeader().setStretchLastSection(True)
-        self.one_time_payments_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.one_time_payments_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        ], {0: str, 2: gbp, 3: display_date})
         
         layout.addLayout(button_layout)
         layout.addWidget(self.one_time_payments_table)
@@ -1248,14 +1866,14 @@ class FinanceApp(QMainWindow):
         summary_group.setLayout(summary_layout)
         
         # History table
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(7)
-        self.history_table.setHorizontalHeaderLabels([
+        self.history_table = self.create_table_view([
             "Month/Year", "Total Payments", "Total Income", "Savings", "Net Savings", "Actions", ""
-        ])
-        self.history_table.horizontalHeader().setStretchLastSection(True)
-        self.history_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.history_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        ], {1: gbp, 2: gbp, 3: gbp, 4: gbp})
+        # One delegate paints every row's View Details button, so rows paged in
+        # or reloaded need no widgets of their own
+        details_delegate = ButtonDelegate("View Details", self.history_table)
+        details_delegate.clicked.connect(self.on_history_details_clicked)
+        self.history_table.setItemDelegateForColumn(5, details_delegate)
         
         layout.addWidget(summary_group)
         layout.addWidget(self.history_table)
@@ -1271,7 +1889,7 @@ class FinanceApp(QMainWindow):
         # Use explicit column names to ensure correct order regardless of ALTER TABLE
         cursor.execute("""
             SELECT id, name, amount, payment_day, 
-                   COALESCE(payment_type, 'debit') as payment_type,
+                   LOWER(COALESCE(payment_type, 'debit')) as payment_type,
                    last_paid_date, created_at,
                    COALESCE(delete_next_month, 0) as delete_next_month,
                    pay_period_months, period_start_date,
@@ -1279,15 +1897,17 @@ class FinanceApp(QMainWindow):
             FROM recurring_payments 
             ORDER BY name
         """)
-        payments = cursor.fetchall()
-        conn.close()
         
-        self.recurring_payments_table.setRowCount(len(payments))
+        rows = []
+        colors = {}
+        # Per-row state the mark handlers need, so they don't have to re-query it
+        records = []
         today = datetime.today().date()
         current_month = today.month
         current_year = today.year
         
-        for row_idx, payment in enumerate(payments):
+        # Rows are streamed from the cursor rather than collected into a list first
+        for row_idx, payment in enumerate(cursor):
             # Column order: id, name, amount, payment_day, payment_type, last_paid_date, created_at, delete_next_month, pay_period_months, period_start_date, is_active
             payment_id, name, amount, payment_day, payment_type, last_paid_date, created_at, delete_next_month, pay_period_months, period_start_date, is_active = payment
             
@@ -1296,37 +1916,15 @@ class FinanceApp(QMainWindow):
                 payment_day, last_paid_date, current_month, current_year
             )
             
-            # ID
-            self.recurring_payments_table.setItem(row_idx, 0, QTableWidgetItem(str(payment_id)))
-            
-            # Name
-            self.recurring_payments_table.setItem(row_idx, 1, QTableWidgetItem(name))
-            
-            # Amount
-            self.recurring_payments_table.setItem(row_idx, 2, QTableWidgetItem(f"£{amount:,.2f}"))
-            
             # Payment Type
-            type_item = QTableWidgetItem(payment_type.capitalize() if payment_type else "Debit")
-            if payment_type and payment_type.lower() == 'credit':
-                type_item.setForeground(Qt.GlobalColor.cyan)
+            if payment_type == 'credit':
+                colors[(row_idx, 3)] = Qt.GlobalColor.cyan
             else:
-                type_item.setForeground(Qt.GlobalColor.red)
-            self.recurring_payments_table.setItem(row_idx, 3, type_item)
-            
-            # Payment Day
-            self.recurring_payments_table.setItem(row_idx, 4, QTableWidgetItem(f"Day {int(payment_day)}"))
-            
-            # Last Month
-            self.recurring_payments_table.setItem(row_idx, 5, QTableWidgetItem(last_month_date.strftime("%d/%m/%Y")))
+                colors[(row_idx, 3)] = Qt.GlobalColor.red
             
             # This Month
-            item = QTableWidgetItem(this_month_date.strftime("%d/%m/%Y"))
             if this_month_date <= today:
-                item.setForeground(Qt.GlobalColor.yellow)  # Overdue or due today
-            self.recurring_payments_table.setItem(row_idx, 6, item)
-            
-            # Next Month
-            self.recurring_payments_table.setItem(row_idx, 7, QTableWidgetItem(next_month_date.strftime("%d/%m/%Y")))
+                colors[(row_idx, 6)] = Qt.GlobalColor.yellow  # Overdue or due today
             
             # Status (Delete Next Month indicator + Pay Period info)
             status_parts = []
@@ -1345,13 +1943,7 @@ class FinanceApp(QMainWindow):
                 # Calculate remaining months
                 if period_start_date:
                     try:
-                        if isinstance(period_start_date, str):
-                            try:
-                                start_date = datetime.strptime(period_start_date, "%Y-%m-%d %H:%M:%S").date()
-                            except ValueError:
-                                start_date = datetime.strptime(period_start_date, "%Y-%m-%d").date()
-                        else:
-                            start_date = period_start_date
+                        start_date = parse_date(str(period_start_date))
                         
                         # Calculate months elapsed
                         months_elapsed = (today.year - start_date.year) * 12 + (today.month - start_date.month)
@@ -1367,74 +1959,37 @@ class FinanceApp(QMainWindow):
                     status_parts.append(f"{pay_period_months} months")
             
             status_text = " | ".join(status_parts)
-            status_item = QTableWidgetItem(status_text)
             
             if not is_active or is_active == 0:
-                status_item.setForeground(Qt.GlobalColor.gray)
+                colors[(row_idx, 8)] = Qt.GlobalColor.gray
             elif delete_next_month and delete_next_month == 1:
-                status_item.setForeground(Qt.GlobalColor.red)
+                colors[(row_idx, 8)] = Qt.GlobalColor.red
             elif "Expired" in status_text:
-                status_item.setForeground(Qt.GlobalColor.yellow)
+                colors[(row_idx, 8)] = Qt.GlobalColor.yellow
             else:
-                status_item.setForeground(Qt.GlobalColor.green)
-            
-            self.recurring_payments_table.setItem(row_idx, 8, status_item)
+                colors[(row_idx, 8)] = Qt.GlobalColor.green
+            
+            rows.append((
+                payment_id,
+                name,
+                amount,
+                payment_type.capitalize(),
+                f"Day {int(payment_day)}",
+                last_month_date,
+                this_month_date,
+                next_month_date,
+                status_text,
+            ))
+            records.append({'amount': amount, 'last_paid_date': last_paid_date, 'delete_next_month': delete_next_month})
+        
+        with batched(self.recurring_payments_table):
+            self.recurring_payments_table.model().set_rows(rows, colors, records)
     
     def calculate_payment_dates(self, payment_day, last_paid_date, current_month, current_year):
-        today = datetime.today().date()
-        
-        # Calculate this month's payment date
-        try:
-            this_month_date = datetime(current_year, current_month, int(payment_day)).date()
-        except ValueError:
-            # Handle day 31 in months with fewer days
-            last_day = (datetime(current_year, current_month, 1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            this_month_date = last_day
-        
-        # Calculate last month's payment date
-        if last_paid_date:
-            # Handle both date-only and datetime strings
-            try:
-                # Try parsing as datetime first (includes time)
-                last_paid = datetime.strptime(str(last_paid_date), "%Y-%m-%d %H:%M:%S").date()
-            except ValueError:
-                try:
-                    # Try parsing as date only
-                    last_paid = datetime.strptime(str(last_paid_date), "%Y-%m-%d").date()
-                except ValueError:
-                    # If both fail, try to extract just the date part
-                    last_paid = datetime.strptime(str(last_paid_date).split()[0], "%Y-%m-%d").date()
-            last_month_date = last_paid
-        else:
-            # Calculate previous month
-            if current_month == 1:
-                prev_month = 12
-                prev_year = current_year - 1
-            else:
-                prev_month = current_month - 1
-                prev_year = current_year
-            
-            try:
-                last_month_date = datetime(prev_year, prev_month, int(payment_day)).date()
-            except ValueError:
-                last_day = (datetime(prev_year, prev_month, 1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-                last_month_date = last_day
-        
-        # Calculate next month's payment date
-        if current_month == 12:
-            next_month = 1
-            next_year = current_year + 1
-        else:
-            next_month = current_month + 1
-            next_year = current_year
-        
-        try:
-            next_month_date = datetime(next_year, next_month, int(payment_day)).date()
-        except ValueError:
-            last_day = (datetime(next_year, next_month, 1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            next_month_date = last_day
-        
-        return last_month_date, this_month_date, next_month_date
+        # Normalise to hashable scalars so the cached helper can be shared
+        # between the Summary and Recurring Payments tabs
+        last_paid = str(last_paid_date)[:10] if last_paid_date else None
+        return payment_dates(int(payment_day), last_paid, current_month, current_year)
     
     def add_recurring_payment(self):
         dialog = PaymentDialog(self)
@@ -1456,22 +2011,23 @@ class FinanceApp(QMainWindow):
                 (data['name'], data['amount'], data['payment_day'], data['payment_type'], 
                  data['pay_period_months'], period_start)
             )
-            conn.commit()
-            conn.close()
+            self.commit_changes(conn)
             
             self.load_recurring_payments()
             QMessageBox.information(self, "Success", "Recurring payment added successfully.")
     
     def edit_recurring_payment(self):
-        row = self.recurring_payments_table.currentRow()
+        row = self.recurring_payments_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select a payment to edit.")
             return
         
-        payment_id = int(self.recurring_payments_table.item(row, 0).text())
+        payment_id = self.recurring_payments_table.model().rows[row][0]
         
         conn = self.db.get_connection()
         cursor = conn.cursor()
+        # The dialogs read the row by column name
+        cursor.row_factory = sqlite3.Row
         cursor.execute("""
             SELECT id, name, amount, payment_day, 
                    COALESCE(payment_type, 'debit') as payment_type,
@@ -1480,7 +2036,6 @@ class FinanceApp(QMainWindow):
             FROM recurring_payments WHERE id = ?
         """, (payment_id,))
         payment = cursor.fetchone()
-        conn.close()
         
         if payment:
             dialog = PaymentDialog(self, payment)
@@ -1504,14 +2059,22 @@ class FinanceApp(QMainWindow):
                     (data['name'], data['amount'], data['payment_day'], data['payment_type'], 
                      data['pay_period_months'], new_period_start, payment_id)
                 )
-                conn.commit()
-                conn.close()
+                # Keep the credit/debit split of this payment's history, and the
+                # summaries of the months it touches, in step
+                cursor.execute(
+                    """UPDATE payment_history SET effective_type = ?
+                       WHERE payment_id = ? AND payment_type = 'recurring'
+                       RETURNING month, year""",
+                    ('credit' if data['payment_type'] == 'credit' else 'debit', payment_id)
+                )
+                self.update_monthly_summary(set(cursor.fetchall()), cursor)
+                self.commit_changes(conn)
                 
                 self.load_recurring_payments()
                 QMessageBox.information(self, "Success", "Recurring payment updated successfully.")
     
     def delete_recurring_payment(self):
-        row = self.recurring_payments_table.currentRow()
+        row = self.recurring_payments_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select a payment to delete.")
             return
@@ -1522,33 +2085,30 @@ class FinanceApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            payment_id = int(self.recurring_payments_table.item(row, 0).text())
+            payment_id = self.recurring_payments_table.model().rows[row][0]
             
             conn = self.db.get_connection()
             cursor = conn.cursor()
             cursor.execute("DELETE FROM recurring_payments WHERE id = ?", (payment_id,))
-            conn.commit()
-            conn.close()
+            self.commit_changes(conn)
             
             self.load_recurring_payments()
             QMessageBox.information(self, "Success", "Payment deleted successfully.")
     
     def mark_delete_next_month(self):
         """Mark or unmark a payment for deletion next month"""
-        row = self.recurring_payments_table.currentRow()
+        row = self.recurring_payments_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select a payment to mark for deletion next month.")
             return
         
-        payment_id = int(self.recurring_payments_table.item(row, 0).text())
-        payment_name = self.recurring_payments_table.item(row, 1).text()
+        payment_id = self.recurring_payments_table.model().rows[row][0]
+        payment_name = self.recurring_payments_table.model().rows[row][1]
         
-        # Check current status
+        # Current status, as loaded into the table
+        is_marked = self.recurring_payments_table.model().records[row]['delete_next_month'] == 1
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT delete_next_month FROM recurring_payments WHERE id = ?", (payment_id,))
-        result = cursor.fetchone()
-        is_marked = result and result[0] == 1
         
         if is_marked:
             # Unmark for deletion
@@ -1560,13 +2120,10 @@ class FinanceApp(QMainWindow):
             
             if reply == QMessageBox.StandardButton.Yes:
                 cursor.execute("UPDATE recurring_payments SET delete_next_month = 0 WHERE id = ?", (payment_id,))
-                conn.commit()
-                conn.close()
+                self.commit_changes(conn)
                 
                 self.load_recurring_payments()
                 QMessageBox.information(self, "Success", f"'{payment_name}' will no longer be deleted next month.")
-            else:
-                conn.close()
         else:
             # Mark for deletion
             reply = QMessageBox.question(
@@ -1577,172 +2134,157 @@ class FinanceApp(QMainWindow):
             
             if reply == QMessageBox.StandardButton.Yes:
                 cursor.execute("UPDATE recurring_payments SET delete_next_month = 1 WHERE id = ?", (payment_id,))
-                conn.commit()
-                conn.close()
+                self.commit_changes(conn)
                 
                 self.load_recurring_payments()
                 QMessageBox.information(self, "Success", f"'{payment_name}' will be deleted next month.")
-            else:
-                conn.close()
+    
+    def run_startup_checks(self):
+        """Database side of the startup checks; runs on the thread pool"""
+        return self.check_and_disable_expired_payments(), self.check_and_delete_pending_deletions()
+    
+    def on_startup_checks_done(self, result):
+        """Report what the startup checks changed and reload the payments table"""
+        expired_names, deleted_names = result
+        
+        if expired_names:
+            names_list = "\n".join([f"• {name}" for name in expired_names])
+            QMessageBox.information(
+                self,
+                "Payments Expired",
+                f"The following {len(expired_names)} payment(s) have reached the end of their pay period and have been disabled:\n\n{names_list}"
+            )
+        
+        if deleted_names:
+            names_list = "\n".join([f"• {name}" for name in deleted_names])
+            QMessageBox.information(
+                self, 
+                "Payments Deleted", 
+                f"New month detected! The following {len(deleted_names)} payment(s) marked for deletion have been removed:\n\n{names_list}"
+            )
+        
+        if expired_names or deleted_names:
+            self.summary_cache.clear()
+            self.schedule_refresh('load_recurring_payments', 'load_summary')
+    
+    def on_startup_checks_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to check for expired and deleted payments: {error}")
     
     def check_and_delete_pending_deletions(self):
-        """Check if it's a new month and delete payments marked for deletion"""
+        """Check if it's a new month and delete payments marked for deletion, returning their names"""
         today = datetime.today().date()
         current_month = today.month
         current_year = today.year
         
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Get the last month we checked for deletions
-        cursor.execute("""
-            SELECT value FROM app_settings WHERE key = 'last_deletion_check_month'
-        """)
-        result = cursor.fetchone()
-        
-        last_check_month = None
-        last_check_year = None
-        
-        if result:
-            try:
-                # Format: "YYYY-MM"
-                parts = result[0].split('-')
-                last_check_year = int(parts[0])
-                last_check_month = int(parts[1])
-            except:
-                pass
-        
-        # Check if we're in a new month compared to last check
-        is_new_month = False
-        if last_check_month is None or last_check_year is None:
-            # First time running, don't delete yet
-            is_new_month = False
-        elif current_year > last_check_year or (current_year == last_check_year and current_month > last_check_month):
-            # New month detected
-            is_new_month = True
-        
-        # Update the last check date
-        cursor.execute("""
-            INSERT OR REPLACE INTO app_settings (key, value, updated_at)
-            VALUES ('last_deletion_check_month', ?, CURRENT_TIMESTAMP)
-        """, (f"{current_year}-{current_month:02d}",))
-        
-        # Only delete if we're in a new month
-        if is_new_month:
+        # Once this month has been handled the stored value can't change again
+        # for the life of the process, so skip the settings round trip
+        if self.last_deletion_check == (current_year, current_month):
+            return []
+        
+        # app_settings stays the record shared with the notification service;
+        # QSettings mirrors it (once it is committed and seen again) so later
+        # startups in the same month skip SQL. The mirror is keyed by the
+        # database's absolute path (DB_FILE is relative to the working
+        # directory), with slashes swapped out since QSettings reads them as groups
+        check_month = f"{current_year}-{current_month:02d}"
+        settings = QSettings("FinanceApp", "FinanceTracker")
+        db_path = os.path.abspath(self.db.db_file).replace("\\", "|").replace("/", "|")
+        settings_key = f"last_deletion_check_month/{db_path}"
+        if settings.value(settings_key) == check_month:
+            self.last_deletion_check = (current_year, current_month)
+            return []
+        
+        # Runs on a worker thread; the GUI clears the summary cache afterwards
+        with self.db.transaction() as cursor:
+            # Get the last month we checked for deletions
             cursor.execute("""
-                SELECT id, name FROM recurring_payments 
-                WHERE delete_next_month = 1
+                SELECT value FROM app_settings WHERE key = 'last_deletion_check_month'
             """)
-            pending_deletions = cursor.fetchall()
+            result = cursor.fetchone()
             
-            if pending_deletions:
-                deleted_count = 0
-                deleted_names = []
-                
-                for payment_id, payment_name in pending_deletions:
-                    # Delete the payment
-                    cursor.execute("DELETE FROM recurring_payments WHERE id = ?", (payment_id,))
-                    deleted_count += 1
-                    deleted_names.append(payment_name)
-                
-                if deleted_count > 0:
-                    conn.commit()
-                    conn.close()
-                    
-                    # Show notification
-                    names_list = "\n".join([f"• {name}" for name in deleted_names])
-                    QMessageBox.information(
-                        self, 
-                        "Payments Deleted", 
-                        f"New month detected! The following {deleted_count} payment(s) marked for deletion have been removed:\n\n{names_list}"
-                    )
-                    
-                    # Reload the table
-                    self.load_recurring_payments()
-                    return True
-        
-        conn.commit()
-        conn.close()
-        return False
+            last_check_month = None
+            last_check_year = None
+            
+            if result:
+                try:
+                    # Format: "YYYY-MM"
+                    parts = result[0].split('-')
+                    last_check_year = int(parts[0])
+                    last_check_month = int(parts[1])
+                except:
+                    pass
+            
+            # Check if we're in a new month compared to last check
+            is_new_month = False
+            if last_check_month is None or last_check_year is None:
+                # First time running, don't delete yet
+                is_new_month = False
+            elif current_year > last_check_year or (current_year == last_check_year and current_month > last_check_month):
+                # New month detected
+                is_new_month = True
+            
+            # Already checked this month - nothing to delete or record
+            if last_check_year == current_year and last_check_month == current_month:
+                self.last_deletion_check = (current_year, current_month)
+                settings.setValue(settings_key, check_month)
+                return []
+            
+            # Update the last check date
+            cursor.execute("""
+                INSERT OR REPLACE INTO app_settings (key, value, updated_at)
+                VALUES ('last_deletion_check_month', ?, CURRENT_TIMESTAMP)
+            """, (check_month,))
+            self.last_deletion_check = (current_year, current_month)
+            
+            # Only delete if we're in a new month
+            if is_new_month:
+                # One statement deletes them and hands back the names for the
+                # message (served by idx_pending_del; RETURNING needs SQLite 3.35+)
+                cursor.execute("""
+                    DELETE FROM recurring_payments 
+                    WHERE delete_next_month = 1
+                    RETURNING name
+                """)
+                return [row[0] for row in cursor.fetchall()]
+            
+            return []
     
     def check_and_disable_expired_payments(self):
-        """Check for payments that have exceeded their pay period and disable them"""
+        """Check for payments that have exceeded their pay period and disable them, returning their names"""
         today = datetime.today().date()
         current_month = today.month
         current_year = today.year
         
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Get all active payments with pay periods
-        cursor.execute("""
-            SELECT id, name, pay_period_months, period_start_date 
-            FROM recurring_payments 
-            WHERE is_active = 1 
-            AND pay_period_months IS NOT NULL 
-            AND pay_period_months != -1
-        """)
-        payments_with_periods = cursor.fetchall()
-        
-        expired_count = 0
-        expired_names = []
-        
-        for payment_id, name, pay_period_months, period_start_date in payments_with_periods:
-            if period_start_date:
-                try:
-                    if isinstance(period_start_date, str):
-                        try:
-                            start_date = datetime.strptime(period_start_date, "%Y-%m-%d %H:%M:%S").date()
-                        except ValueError:
-                            start_date = datetime.strptime(period_start_date, "%Y-%m-%d").date()
-                    else:
-                        start_date = period_start_date
-                    
-                    # Calculate months elapsed
-                    months_elapsed = (current_year - start_date.year) * 12 + (current_month - start_date.month)
-                    
-                    # Check if period has expired
-                    if months_elapsed >= pay_period_months:
-                        # Disable the payment
-                        cursor.execute(
-                            "UPDATE recurring_payments SET is_active = 0 WHERE id = ?",
-                            (payment_id,)
-                        )
-                        expired_count += 1
-                        expired_names.append(name)
-                except Exception as e:
-                    print(f"Error checking payment {name}: {e}")
-                    continue
-        
-        if expired_count > 0:
-            conn.commit()
-            conn.close()
-            
-            # Show notification
-            names_list = "\n".join([f"• {name}" for name in expired_names])
-            QMessageBox.information(
-                self,
-                "Payments Expired",
-                f"The following {expired_count} payment(s) have reached the end of their pay period and have been disabled:\n\n{names_list}"
-            )
-            
-            # Reload the table
-            self.load_recurring_payments()
-            return True
-        
-        conn.commit()
-        conn.close()
-        return False
+        # Runs on a worker thread; the GUI clears the summary cache afterwards
+        with self.db.transaction() as cursor:
+            # Disable active payments whose pay period has run out (months elapsed
+            # since the period started, by calendar month, reached
+            # pay_period_months) in one statement, however many there are
+            cursor.execute("""
+                UPDATE recurring_payments SET is_active = 0
+                WHERE is_active = 1 
+                AND pay_period_months IS NOT NULL 
+                AND pay_period_months != -1
+                AND period_start_date IS NOT NULL
+                AND (? - CAST(strftime('%Y', period_start_date) AS INTEGER)) * 12
+                    + (? - CAST(strftime('%m', period_start_date) AS INTEGER)) >= pay_period_months
+                RETURNING name
+            """, (current_year, current_month))
+            
+            return [name for name, in cursor.fetchall()]
     
     def mark_recurring_payment_paid(self):
-        row = self.recurring_payments_table.currentRow()
+        row = self.recurring_payments_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select a payment to mark as paid.")
             return
         
-        payment_id = int(self.recurring_payments_table.item(row, 0).text())
-        payment_name = self.recurring_payments_table.item(row, 1).text()
-        amount = float(self.recurring_payments_table.item(row, 2).text().replace('£', '').replace(',', ''))
+        payment_id = self.recurring_payments_table.model().rows[row][0]
+        payment_name = self.recurring_payments_table.model().rows[row][1]
+        record = self.recurring_payments_table.model().records[row]
+        amount = record['amount']
+        # Store old last_paid_date for undo (the table holds the current value)
+        old_last_paid = record['last_paid_date']
         
         today = datetime.today().date()
         
@@ -1750,55 +2292,43 @@ class FinanceApp(QMainWindow):
         cursor = conn.cursor()
         
         try:
-            # Store old last_paid_date for undo
-            cursor.execute("SELECT last_paid_date FROM recurring_payments WHERE id = ?", (payment_id,))
-            old_last_paid = cursor.fetchone()[0]
+            # One write transaction for the whole mark-paid sequence
+            cursor.execute("BEGIN IMMEDIATE")
             
             # Update last paid date
-            cursor.execute(
-                "UPDATE recurring_payments SET last_paid_date = ? WHERE id = ?",
-                (today.strftime("%Y-%m-%d"), payment_id)
-            )
+            cursor.execute(SQL_SET_LAST_PAID, (today.isoformat(), payment_id))
             
             # Add to payment history
             cursor.execute(
-                """INSERT INTO payment_history (payment_id, payment_type, name, amount, payment_date, month, year)
-                   VALUES (?, 'recurring', ?, ?, ?, ?, ?)""",
-                (payment_id, payment_name, amount, today.strftime("%Y-%m-%d"), today.month, today.year)
+                SQL_INSERT_HISTORY_RETURNING,
+                (payment_id, 'recurring', payment_name, amount, today.isoformat(), today.month, today.year)
             )
             
-            history_id = cursor.lastrowid
+            history_id = cursor.fetchone()[0]
             
             # Store in recent_transactions for undo
-            cursor.execute(
-                """INSERT INTO recent_transactions 
-                   (history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date)
-                   VALUES (?, ?, 'recurring', ?, ?, ?, ?, ?, 'mark_paid', ?)""",
-                (history_id, payment_id, payment_name, amount, today.strftime("%Y-%m-%d"), today.month, today.year, old_last_paid)
-            )
+            recent = (history_id, payment_id, 'recurring', payment_name, amount, today.isoformat(), today.month, today.year, 'mark_paid', old_last_paid)
+            cursor.execute(SQL_INSERT_RECENT, recent)
+            recent = (cursor.lastrowid,) + recent
             
             # Store old last_paid_date in a separate column (we'll use a text field in the table)
             # For now, we'll just store it in memory or use a temp approach
             
-            conn.commit()
-            conn.close()
+            # Update monthly summary in the same transaction
+            self.update_monthly_summary({(today.month, today.year)}, cursor)
             
-            # Update monthly summary (with connection closed)
-            self.update_monthly_summary(today.month, today.year)
+            self.commit_changes(conn)
+            self.recent_transactions.append(recent)
             
-            self.load_recurring_payments()
-            self.load_history()
-            self.load_summary()  # Refresh summary tab
+            self.schedule_refresh('load_recurring_payments', 'load_history', 'load_summary')
             QMessageBox.information(self, "Success", f"Payment '{payment_name}' marked as paid.")
         except Exception as e:
             conn.rollback()
-            conn.close()
             QMessageBox.critical(self, "Error", f"Failed to mark payment as paid: {str(e)}")
     
     def update_payment_dates(self):
         """Update payment dates based on current month"""
-        self.load_recurring_payments()
-        self.load_one_time_payments()
+        self.schedule_refresh('load_recurring_payments', 'load_one_time_payments')
     
     def detect_payments(self):
         """Detect payments that have passed their due date and mark them as paid"""
@@ -1813,43 +2343,33 @@ class FinanceApp(QMainWindow):
         detected_payments = []
         
         try:
+            # Recurring payments with a history entry this month, fetched once
+            cursor.execute("""
+                SELECT payment_id FROM payment_history
+                WHERE payment_type = 'recurring' AND month = ? AND year = ?
+            """, (current_month, current_year))
+            paid_ids = {row[0] for row in cursor.fetchall()}
+            
             # Check recurring payments
             cursor.execute("SELECT id, name, amount, payment_day, last_paid_date FROM recurring_payments WHERE COALESCE(is_active, 1) = 1")
             recurring_payments = cursor.fetchall()
             
             for payment_id, name, amount, payment_day, last_paid_date in recurring_payments:
                 # Calculate this month's payment date
-                try:
-                    this_month_date = datetime(current_year, current_month, int(payment_day)).date()
-                except ValueError:
-                    # Handle day 31 in months with fewer days
-                    last_day = (datetime(current_year, current_month, 1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-                    this_month_date = last_day
+                this_month_date = day_in_month(current_year, current_month, int(payment_day))
                 
                 # Check if payment date has passed and hasn't been paid this month
                 if this_month_date <= today:
                     # Check if already paid this month
                     if last_paid_date:
-                        # Handle both date-only and datetime strings
-                        try:
-                            last_paid = datetime.strptime(str(last_paid_date), "%Y-%m-%d %H:%M:%S").date()
-                        except ValueError:
-                            try:
-                                last_paid = datetime.strptime(str(last_paid_date), "%Y-%m-%d").date()
-                            except ValueError:
-                                last_paid = datetime.strptime(str(last_paid_date).split()[0], "%Y-%m-%d").date()
+                        # Date-only or datetime string; the first 10 characters are the date
+                        last_paid = parse_date(str(last_paid_date))
                         # If last paid date is in the same month and year, skip
                         if last_paid.month == current_month and last_paid.year == current_year:
                             continue
                     
                     # Check if there's already a payment history entry for this month
-                    cursor.execute("""
-                        SELECT COUNT(*) FROM payment_history
-                        WHERE payment_id = ? AND payment_type = 'recurring'
-                        AND month = ? AND year = ?
-                    """, (payment_id, current_month, current_year))
-                    
-                    if cursor.fetchone()[0] == 0:
+                    if payment_id not in paid_ids:
                         # Mark as paid
                         detected_payments.append(('recurring', payment_id, name, amount, this_month_date))
                         detected_count += 1
@@ -1859,33 +2379,32 @@ class FinanceApp(QMainWindow):
                 SELECT id, name, amount, payment_date, paid
                 FROM one_time_payments
                 WHERE paid = 0 AND payment_date <= ?
-            """, (today.strftime("%Y-%m-%d"),))
+            """, (today.isoformat(),))
             
             one_time_payments = cursor.fetchall()
             
+            # One-time payments already recorded, keyed by (id, date)
+            cursor.execute("""
+                SELECT payment_id, payment_date FROM payment_history
+                WHERE payment_type = 'one_time' AND payment_date <= ?
+            """, (today.isoformat(),))
+            recorded_one_time = set(cursor.fetchall())
+            
             for payment_id, name, amount, payment_date_str, paid in one_time_payments:
-                payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d").date()
+                payment_date = parse_date(payment_date_str)
                 
                 # Check if there's already a payment history entry
-                cursor.execute("""
-                    SELECT COUNT(*) FROM payment_history
-                    WHERE payment_id = ? AND payment_type = 'one_time'
-                    AND payment_date = ?
-                """, (payment_id, payment_date_str))
-                
-                if cursor.fetchone()[0] == 0:
+                if (payment_id, payment_date_str) not in recorded_one_time:
                     detected_payments.append(('one_time', payment_id, name, amount, payment_date))
                     detected_count += 1
             
-            conn.close()
-            
             if detected_count == 0:
                 QMessageBox.information(self, "No Payments Detected", 
                     "No payments found that have passed their due date and haven't been marked as paid.")
                 return
             
             # Ask user if they want to mark all detected payments as paid
-            payment_list = "\n".join([f"• {name}: £{amount:,.2f} ({ptype})" for ptype, _, name, amount, _ in detected_payments])
+            payment_list = "\n".join([f"• {name}: {gbp(amount)} ({ptype})" for ptype, _, name, amount, _ in detected_payments])
             
             reply = QMessageBox.question(
                 self, "Detect Payments",
@@ -1902,91 +2421,62 @@ class FinanceApp(QMainWindow):
                 # Track which months need summary updates (to avoid duplicate updates)
                 months_to_update = set()
                 
+                # Build every row up front so each statement runs once for the whole batch
+                # (recurring payments are recorded as paid today, one-time ones on their own date)
+                history_rows = []
+                recurring_updates = []
+                one_time_updates = []
+                today_str = today.isoformat()
+                
+                for ptype, payment_id, name, amount, payment_date in detected_payments:
+                    paid_date = today if ptype == 'recurring' else payment_date
+                    history_rows.append((payment_id, ptype, name, amount, paid_date.isoformat(), paid_date.month, paid_date.year))
+                    months_to_update.add((paid_date.month, paid_date.year))
+                    if ptype == 'recurring':
+                        recurring_updates.append((today_str, payment_id))
+                    else:
+                        one_time_updates.append((1, payment_id))
+                
                 try:
-                    for ptype, payment_id, name, amount, payment_date in detected_payments:
-                        try:
-                            if ptype == 'recurring':
-                                # Store old last_paid_date for undo
-                                cursor.execute("SELECT last_paid_date FROM recurring_payments WHERE id = ?", (payment_id,))
-                                old_last_paid = cursor.fetchone()[0]
-                                
-                                # Update last paid date
-                                cursor.execute(
-                                    "UPDATE recurring_payments SET last_paid_date = ? WHERE id = ?",
-                                    (today.strftime("%Y-%m-%d"), payment_id)
-                                )
-                                
-                                # Add to payment history (using current amount - this preserves historical records)
-                                cursor.execute(
-                                    """INSERT INTO payment_history (payment_id, payment_type, name, amount, payment_date, month, year)
-                                       VALUES (?, 'recurring', ?, ?, ?, ?, ?)""",
-                                    (payment_id, name, amount, today.strftime("%Y-%m-%d"), today.month, today.year)
-                                )
-                                
-                                history_id = cursor.lastrowid
-                                
-                                # Store in recent_transactions for undo
-                                cursor.execute(
-                                    """INSERT INTO recent_transactions 
-                                       (history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date)
-                                       VALUES (?, ?, 'recurring', ?, ?, ?, ?, ?, 'mark_paid', ?)""",
-                                    (history_id, payment_id, name, amount, today.strftime("%Y-%m-%d"), today.month, today.year, old_last_paid)
-                                )
-                                
-                                months_to_update.add((today.month, today.year))
-                                
-                            elif ptype == 'one_time':
-                                # Update paid status
-                                cursor.execute("UPDATE one_time_payments SET paid = 1 WHERE id = ?", (payment_id,))
-                                
-                                # Add to payment history
-                                cursor.execute(
-                                    """INSERT INTO payment_history (payment_id, payment_type, name, amount, payment_date, month, year)
-                                       VALUES (?, 'one_time', ?, ?, ?, ?, ?)""",
-                                    (payment_id, name, amount, payment_date.strftime("%Y-%m-%d"), payment_date.month, payment_date.year)
-                                )
-                                
-                                history_id = cursor.lastrowid
-                                
-                                # Store in recent_transactions for undo
-                                cursor.execute(
-                                    """INSERT INTO recent_transactions 
-                                       (history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date)
-                                       VALUES (?, ?, 'one_time', ?, ?, ?, ?, ?, 'mark_paid', NULL)""",
-                                    (history_id, payment_id, name, amount, payment_date.strftime("%Y-%m-%d"), payment_date.month, payment_date.year)
-                                )
-                                
-                                months_to_update.add((payment_date.month, payment_date.year))
-                        
-                        except Exception as e:
-                            print(f"Error processing payment {name}: {e}")
-                            continue
+                    # Take the write lock up front so the new history ids are contiguous
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM payment_history")
+                    last_history_id = cursor.fetchone()[0]
+                    
+                    # Add to payment history (using current amount - this preserves historical records)
+                    cursor.executemany(SQL_INSERT_HISTORY, history_rows)
                     
-                    conn.commit()
-                    conn.close()
+                    # Store in recent_transactions for undo, capturing the old
+                    # last_paid_date before it is overwritten below
+                    cursor.execute(SQL_RECENT_FROM_HISTORY, (last_history_id,))
+                    recent = sorted(cursor.fetchall())
                     
-                    # Update monthly summaries AFTER closing the main connection
-                    for month, year in months_to_update:
-                        self.update_monthly_summary(month, year)
+                    # Update last paid dates / paid status
+                    cursor.executemany(SQL_SET_LAST_PAID, recurring_updates)
+                    cursor.executemany(SQL_SET_ONE_TIME_PAID, one_time_updates)
+                    
+                    # Update monthly summaries in the same transaction
+                    self.update_monthly_summary(months_to_update, cursor)
+                    
+                    self.commit_changes(conn)
+                    self.recent_transactions.extend(recent)
                     
                     # Refresh all tables
-                    self.load_recurring_payments()
-                    self.load_one_time_payments()
-                    self.load_history()
-                    self.load_summary()  # Refresh summary tab
+                    self.schedule_refresh(
+                        'load_recurring_payments', 'load_one_time_payments',
+                        'load_history', 'load_summary',
+                    )
                     
                     QMessageBox.information(self, "Success", 
                         f"Successfully marked {detected_count} payment(s) as paid.")
                 
                 except Exception as e:
                     conn.rollback()
-                    conn.close()
                     QMessageBox.critical(self, "Error", f"Failed to mark payments as paid: {str(e)}")
         
         except Exception as e:
             if conn:
                 conn.rollback()
-                conn.close()
             QMessageBox.critical(self, "Error", f"Failed to detect payments: {str(e)}")
     
     def undo_last_payment(self):
@@ -1995,20 +2485,22 @@ class FinanceApp(QMainWindow):
         cursor = conn.cursor()
         
         try:
-            # Get the most recent transaction
-            cursor.execute("""
-                SELECT id, history_id, payment_id, payment_type, name, amount, 
-                       payment_date, month, year, action_type, old_last_paid_date
-                FROM recent_transactions
-                ORDER BY created_at DESC
-                LIMIT 1
-            """)
-            
-            transaction = cursor.fetchone()
+            # Transactions made in this session are kept in memory; fall back to
+            # the table for ones recorded before the app was started
+            if self.recent_transactions:
+                transaction = self.recent_transactions[-1]
+            else:
+                cursor.execute("""
+                    SELECT id, history_id, payment_id, payment_type, name, amount, 
+                           payment_date, month, year, action_type, old_last_paid_date
+                    FROM recent_transactions
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                """)
+                transaction = cursor.fetchone()
             
             if not transaction:
                 QMessageBox.information(self, "No Transaction", "No recent transaction to undo.")
-                conn.close()
                 return
             
             trans_id, history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date = transaction
@@ -2016,12 +2508,11 @@ class FinanceApp(QMainWindow):
             # Confirm undo
             reply = QMessageBox.question(
                 self, "Confirm Undo", 
-                f"Are you sure you want to undo the last transaction?\n\n{name}: £{amount:,.2f} ({payment_type})",
+                f"Are you sure you want to undo the last transaction?\n\n{name}: {gbp(amount)} ({payment_type})",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             
             if reply != QMessageBox.StandardButton.Yes:
-                conn.close()
                 return
             
             # Delete from payment_history
@@ -2030,73 +2521,68 @@ class FinanceApp(QMainWindow):
             # Restore old state based on payment type
             if payment_type == 'recurring' and action_type == 'mark_paid':
                 # Restore old last_paid_date
-                cursor.execute(
-                    "UPDATE recurring_payments SET last_paid_date = ? WHERE id = ?",
-                    (old_last_paid_date, payment_id)
-                )
+                cursor.execute(SQL_SET_LAST_PAID, (old_last_paid_date, payment_id))
             elif payment_type == 'income' and action_type == 'mark_received':
                 # Restore old last_received_date
-                cursor.execute(
-                    "UPDATE recurring_income SET last_received_date = ? WHERE id = ?",
-                    (old_last_paid_date, payment_id)
-                )
+                cursor.execute(SQL_SET_LAST_RECEIVED, (old_last_paid_date, payment_id))
             elif payment_type == 'one_time' and action_type == 'mark_paid':
                 # Restore paid status to 0
-                cursor.execute("UPDATE one_time_payments SET paid = 0 WHERE id = ?", (payment_id,))
+                cursor.execute(SQL_SET_ONE_TIME_PAID, (0, payment_id))
             
             # Remove from recent_transactions
             cursor.execute("DELETE FROM recent_transactions WHERE id = ?", (trans_id,))
             
-            conn.commit()
-            conn.close()
+            # Update monthly summary in the same transaction
+            self.update_monthly_summary({(month, year)}, cursor)
             
-            # Update monthly summary
-            self.update_monthly_summary(month, year)
+            self.commit_changes(conn)
+            if self.recent_transactions:
+                self.recent_transactions.pop()
             
             # Refresh all tables
-            self.load_recurring_payments()
-            self.load_recurring_income()
-            self.load_one_time_payments()
-            self.load_history()
-            self.load_summary()  # Refresh summary tab
+            self.schedule_refresh(*self.refresh_order)
             
             QMessageBox.information(self, "Success", f"Transaction '{name}' has been undone.")
             
         except Exception as e:
             conn.rollback()
-            conn.close()
             QMessageBox.critical(self, "Error", f"Failed to undo transaction: {str(e)}")
     
     # Database operations for recurring income
     def load_recurring_income(self):
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM recurring_income ORDER BY name")
-        income_list = cursor.fetchall()
-        conn.close()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute("""
+            SELECT id, name, amount, income_day, last_received_date
+            FROM recurring_income
+            ORDER BY name
+        """)
         
-        self.recurring_income_table.setRowCount(len(income_list))
+        rows = []
+        # Per-row state the mark handler needs, so it doesn't re-parse the display text
+        records = []
         
-        for row_idx, income in enumerate(income_list):
-            income_id, name, amount, income_day, last_received_date, created_at = income
-            
-            self.recurring_income_table.setItem(row_idx, 0, QTableWidgetItem(str(income_id)))
-            self.recurring_income_table.setItem(row_idx, 1, QTableWidgetItem(name))
-            self.recurring_income_table.setItem(row_idx, 2, QTableWidgetItem(f"£{amount:,.2f}"))
-            self.recurring_income_table.setItem(row_idx, 3, QTableWidgetItem(f"Day {int(income_day)}"))
-            
+        for income in cursor:
+            last_received_date = income['last_received_date']
             if last_received_date:
-                # Handle both date-only and datetime strings
-                try:
-                    date = datetime.strptime(str(last_received_date), "%Y-%m-%d %H:%M:%S").date()
-                except ValueError:
-                    try:
-                        date = datetime.strptime(str(last_received_date), "%Y-%m-%d").date()
-                    except ValueError:
-                        date = datetime.strptime(str(last_received_date).split()[0], "%Y-%m-%d").date()
-                self.recurring_income_table.setItem(row_idx, 4, QTableWidgetItem(date.strftime("%d/%m/%Y")))
+                # Date-only or datetime string; the first 10 characters are the date
+                received_date = parse_date(str(last_received_date))
+                last_received = display_date(received_date)
             else:
-                self.recurring_income_table.setItem(row_idx, 4, QTableWidgetItem("Never"))
+                last_received = "Never"
+            
+            rows.append((
+                income['id'],
+                income['name'],
+                income['amount'],
+                f"Day {int(income['income_day'])}",
+                last_received,
+            ))
+            records.append({'amount': income['amount'], 'last_received_date': last_received_date})
+        
+        with batched(self.recurring_income_table):
+            self.recurring_income_table.model().set_rows(rows, records=records)
     
     def add_recurring_income(self):
         dialog = IncomeDialog(self)
@@ -2112,25 +2598,25 @@ class FinanceApp(QMainWindow):
                 "INSERT INTO recurring_income (name, amount, income_day) VALUES (?, ?, ?)",
                 (data['name'], data['amount'], data['income_day'])
             )
-            conn.commit()
-            conn.close()
+            self.commit_changes(conn)
             
             self.load_recurring_income()
             QMessageBox.information(self, "Success", "Recurring income added successfully.")
     
     def edit_recurring_income(self):
-        row = self.recurring_income_table.currentRow()
+        row = self.recurring_income_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select an income to edit.")
             return
         
-        income_id = int(self.recurring_income_table.item(row, 0).text())
+        income_id = self.recurring_income_table.model().rows[row][0]
         
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM recurring_income WHERE id = ?", (income_id,))
+        # The dialog reads the row by column name
+        cursor.row_factory = sqlite3.Row
+        cursor.execute("SELECT name, amount, income_day FROM recurring_income WHERE id = ?", (income_id,))
         income = cursor.fetchone()
-        conn.close()
         
         if income:
             dialog = IncomeDialog(self, income)
@@ -2146,14 +2632,13 @@ class FinanceApp(QMainWindow):
                     "UPDATE recurring_income SET name = ?, amount = ?, income_day = ? WHERE id = ?",
                     (data['name'], data['amount'], data['income_day'], income_id)
                 )
-                conn.commit()
-                conn.close()
+                self.commit_changes(conn)
                 
                 self.load_recurring_income()
                 QMessageBox.information(self, "Success", "Recurring income updated successfully.")
     
     def delete_recurring_income(self):
-        row = self.recurring_income_table.currentRow()
+        row = self.recurring_income_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select an income to delete.")
             return
@@ -2164,26 +2649,28 @@ class FinanceApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            income_id = int(self.recurring_income_table.item(row, 0).text())
+            income_id = self.recurring_income_table.model().rows[row][0]
             
             conn = self.db.get_connection()
             cursor = conn.cursor()
             cursor.execute("DELETE FROM recurring_income WHERE id = ?", (income_id,))
-            conn.commit()
-            conn.close()
+            self.commit_changes(conn)
             
             self.load_recurring_income()
             QMessageBox.information(self, "Success", "Income deleted successfully.")
     
     def mark_recurring_income_received(self):
-        row = self.recurring_income_table.currentRow()
+        row = self.recurring_income_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select an income to mark as received.")
             return
         
-        income_id = int(self.recurring_income_table.item(row, 0).text())
-        income_name = self.recurring_income_table.item(row, 1).text()
-        amount = float(self.recurring_income_table.item(row, 2).text().replace('£', '').replace(',', ''))
+        income_id = self.recurring_income_table.model().rows[row][0]
+        income_name = self.recurring_income_table.model().rows[row][1]
+        record = self.recurring_income_table.model().records[row]
+        amount = record['amount']
+        # Old last_received_date for undo
+        old_last_received = record['last_received_date']
         
         today = datetime.today().date()
         
@@ -2191,46 +2678,35 @@ class FinanceApp(QMainWindow):
         cursor = conn.cursor()
         
         try:
-            # Store old last_received_date for undo
-            cursor.execute("SELECT last_received_date FROM recurring_income WHERE id = ?", (income_id,))
-            old_last_received = cursor.fetchone()[0]
+            # One write transaction for the whole mark-received sequence
+            cursor.execute("BEGIN IMMEDIATE")
             
             # Update last received date
-            cursor.execute(
-                "UPDATE recurring_income SET last_received_date = ? WHERE id = ?",
-                (today.strftime("%Y-%m-%d"), income_id)
-            )
+            cursor.execute(SQL_SET_LAST_RECEIVED, (today.isoformat(), income_id))
             
             # Add to payment history (as income)
             cursor.execute(
-                """INSERT INTO payment_history (payment_id, payment_type, name, amount, payment_date, month, year)
-                   VALUES (?, 'income', ?, ?, ?, ?, ?)""",
-                (income_id, income_name, amount, today.strftime("%Y-%m-%d"), today.month, today.year)
+                SQL_INSERT_HISTORY_RETURNING,
+                (income_id, 'income', income_name, amount, today.isoformat(), today.month, today.year)
             )
             
-            history_id = cursor.lastrowid
+            history_id = cursor.fetchone()[0]
             
             # Store in recent_transactions for undo
-            cursor.execute(
-                """INSERT INTO recent_transactions 
-                   (history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date)
-                   VALUES (?, ?, 'income', ?, ?, ?, ?, ?, 'mark_received', ?)""",
-                (history_id, income_id, income_name, amount, today.strftime("%Y-%m-%d"), today.month, today.year, old_last_received)
-            )
+            recent = (history_id, income_id, 'income', income_name, amount, today.isoformat(), today.month, today.year, 'mark_received', old_last_received)
+            cursor.execute(SQL_INSERT_RECENT, recent)
+            recent = (cursor.lastrowid,) + recent
             
-            conn.commit()
-            conn.close()
+            # Update monthly summary in the same transaction
+            self.update_monthly_summary({(today.month, today.year)}, cursor)
             
-            # Update monthly summary (with connection closed)
-            self.update_monthly_summary(today.month, today.year)
+            self.commit_changes(conn)
+            self.recent_transactions.append(recent)
             
-            self.load_recurring_income()
-            self.load_history()
-            self.load_summary()  # Refresh summary tab
+            self.schedule_refresh('load_recurring_income', 'load_history', 'load_summary')
             QMessageBox.information(self, "Success", f"Income '{income_name}' marked as received.")
         except Exception as e:
             conn.rollback()
-            conn.close()
             QMessageBox.critical(self, "Error", f"Failed to mark income as received: {str(e)}")
     
     # Database operations for one-time payments
@@ -2238,34 +2714,35 @@ class FinanceApp(QMainWindow):
         conn = self.db.get_connection()
         cursor = conn.cursor()
         today = datetime.today().date()
-        current_month = today.month
-        current_year = today.year
+        first_day = month_bounds(today.year, today.month)[0]
         
-        # Get payments for current month or future
+        # Get payments for current month or future (a range the date index can seek)
         cursor.execute("""
-            SELECT * FROM one_time_payments 
-            WHERE payment_date >= date('now', 'start of month')
-            OR (strftime('%m', payment_date) = ? AND strftime('%Y', payment_date) = ?)
+            SELECT id, name, amount, payment_date, paid
+            FROM one_time_payments 
+            WHERE payment_date >= ?
             ORDER BY payment_date
-        """, (f"{current_month:02d}", str(current_year)))
-        payments = cursor.fetchall()
-        conn.close()
-        
-        self.one_time_payments_table.setRowCount(len(payments))
-        
-        for row_idx, payment in enumerate(payments):
-            payment_id, name, amount, payment_date, paid, created_at = payment
-            date = datetime.strptime(payment_date, "%Y-%m-%d").date()
-            
-            self.one_time_payments_table.setItem(row_idx, 0, QTableWidgetItem(str(payment_id)))
-            self.one_time_payments_table.setItem(row_idx, 1, QTableWidgetItem(name))
-            self.one_time_payments_table.setItem(row_idx, 2, QTableWidgetItem(f"£{amount:,.2f}"))
-            self.one_time_payments_table.setItem(row_idx, 3, QTableWidgetItem(date.strftime("%d/%m/%Y")))
-            
-            status_item = QTableWidgetItem("✅ Paid" if paid else "❌ Unpaid")
-            if date <= today and not paid:
-                status_item.setForeground(Qt.GlobalColor.yellow)  # Overdue
-            self.one_time_payments_table.setItem(row_idx, 4, status_item)
+        """, (first_day.isoformat(),))
+        
+        rows = []
+        colors = {}
+        
+        for row_idx, payment in enumerate(cursor):
+            payment_id, name, amount, payment_date, paid = payment
+            due_date = parse_date(payment_date)
+            
+            rows.append((
+                payment_id,
+                name,
+                amount,
+                due_date,
+                "✅ Paid" if paid else "❌ Unpaid",
+            ))
+            if due_date <= today and not paid:
+                colors[(row_idx, 4)] = Qt.GlobalColor.yellow  # Overdue
+        
+        with batched(self.one_time_payments_table):
+            self.one_time_payments_table.model().set_rows(rows, colors)
     
     def add_one_time_payment(self):
         dialog = OneTimePaymentDialog(self)
@@ -2281,25 +2758,25 @@ class FinanceApp(QMainWindow):
                 "INSERT INTO one_time_payments (name, amount, payment_date) VALUES (?, ?, ?)",
                 (data['name'], data['amount'], data['payment_date'])
             )
-            conn.commit()
-            conn.close()
+            self.commit_changes(conn)
             
             self.load_one_time_payments()
             QMessageBox.information(self, "Success", "One-time payment added successfully.")
     
     def edit_one_time_payment(self):
-        row = self.one_time_payments_table.currentRow()
+        row = self.one_time_payments_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select a payment to edit.")
             return
         
-        payment_id = int(self.one_time_payments_table.item(row, 0).text())
+        payment_id = self.one_time_payments_table.model().rows[row][0]
         
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM one_time_payments WHERE id = ?", (payment_id,))
+        # The dialog reads the row by column name
+        cursor.row_factory = sqlite3.Row
+        cursor.execute("SELECT name, amount, payment_date FROM one_time_payments WHERE id = ?", (payment_id,))
         payment = cursor.fetchone()
-        conn.close()
         
         if payment:
             dialog = OneTimePaymentDialog(self, payment)
@@ -2315,14 +2792,13 @@ class FinanceApp(QMainWindow):
                     "UPDATE one_time_payments SET name = ?, amount = ?, payment_date = ? WHERE id = ?",
                     (data['name'], data['amount'], data['payment_date'], payment_id)
                 )
-                conn.commit()
-                conn.close()
+                self.commit_changes(conn)
                 
                 self.load_one_time_payments()
                 QMessageBox.information(self, "Success", "One-time payment updated successfully.")
     
     def delete_one_time_payment(self):
-        row = self.one_time_payments_table.currentRow()
+        row = self.one_time_payments_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select a payment to delete.")
             return
@@ -2333,78 +2809,76 @@ class FinanceApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            payment_id = int(self.one_time_payments_table.item(row, 0).text())
+            payment_id = self.one_time_payments_table.model().rows[row][0]
             
             conn = self.db.get_connection()
             cursor = conn.cursor()
             cursor.execute("DELETE FROM one_time_payments WHERE id = ?", (payment_id,))
-            conn.commit()
-            conn.close()
+            self.commit_changes(conn)
             
             self.load_one_time_payments()
             QMessageBox.information(self, "Success", "Payment deleted successfully.")
     
     def mark_one_time_payment_paid(self):
-        row = self.one_time_payments_table.currentRow()
+        row = self.one_time_payments_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "No Selection", "Please select a payment to mark as paid.")
             return
         
-        payment_id = int(self.one_time_payments_table.item(row, 0).text())
-        payment_name = self.one_time_payments_table.item(row, 1).text()
-        amount = float(self.one_time_payments_table.item(row, 2).text().replace('£', '').replace(',', ''))
+        payment_id = self.one_time_payments_table.model().rows[row][0]
+        payment_name = self.one_time_payments_table.model().rows[row][1]
+        amount = self.one_time_payments_table.model().rows[row][2]
         
         conn = self.db.get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute("SELECT payment_date, paid FROM one_time_payments WHERE id = ?", (payment_id,))
+            # One write transaction from the paid check to the summary update,
+            # so the notification service can't mark it in between
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Update paid status, checking it wasn't paid already in the same statement
+            cursor.execute(SQL_MARK_ONE_TIME_PAID, (payment_id,))
             result = cursor.fetchone()
-            payment_date = datetime.strptime(result[0], "%Y-%m-%d").date()
-            was_paid = result[1]
             
-            if was_paid:
+            if result is None:
+                conn.rollback()
                 QMessageBox.warning(self, "Already Paid", "This payment is already marked as paid.")
-                conn.close()
                 return
             
-            # Update paid status
-            cursor.execute("UPDATE one_time_payments SET paid = 1 WHERE id = ?", (payment_id,))
+            payment_date = parse_date(result[0])
             
             # Add to payment history
             cursor.execute(
-                """INSERT INTO payment_history (payment_id, payment_type, name, amount, payment_date, month, year)
-                   VALUES (?, 'one_time', ?, ?, ?, ?, ?)""",
-                (payment_id, payment_name, amount, payment_date.strftime("%Y-%m-%d"), payment_date.month, payment_date.year)
+                SQL_INSERT_HISTORY_RETURNING,
+                (payment_id, 'one_time', payment_name, amount, payment_date.isoformat(), payment_date.month, payment_date.year)
             )
             
-            history_id = cursor.lastrowid
+            history_id = cursor.fetchone()[0]
             
             # Store in recent_transactions for undo
-            cursor.execute(
-                """INSERT INTO recent_transactions 
-                   (history_id, payment_id, payment_type, name, amount, payment_date, month, year, action_type, old_last_paid_date)
-                   VALUES (?, ?, 'one_time', ?, ?, ?, ?, ?, 'mark_paid', NULL)""",
-                (history_id, payment_id, payment_name, amount, payment_date.strftime("%Y-%m-%d"), payment_date.month, payment_date.year)
-            )
+            recent = (history_id, payment_id, 'one_time', payment_name, amount, payment_date.isoformat(), payment_date.month, payment_date.year, 'mark_paid', None)
+            cursor.execute(SQL_INSERT_RECENT, recent)
+            recent = (cursor.lastrowid,) + recent
             
-            conn.commit()
-            conn.close()
+            # Update monthly summary in the same transaction
+            self.update_monthly_summary({(payment_date.month, payment_date.year)}, cursor)
             
-            # Update monthly summary (with connection closed)
-            self.update_monthly_summary(payment_date.month, payment_date.year)
+            self.commit_changes(conn)
+            self.recent_transactions.append(recent)
             
-            self.load_one_time_payments()
-            self.load_history()
-            self.load_summary()  # Refresh summary tab
+            self.schedule_refresh('load_one_time_payments', 'load_history', 'load_summary')
             QMessageBox.information(self, "Success", f"Payment '{payment_name}' marked as paid.")
         except Exception as e:
             conn.rollback()
-            conn.close()
             QMessageBox.critical(self, "Error", f"Failed to mark payment as paid: {str(e)}")
     
     # History and summary operations
     def load_history(self):
+        # Nothing to refresh until the History tab has been opened
+        if self.history_table is None:
+            return
+        
         conn = self.db.get_connection()
         cursor = conn.cursor()
         
@@ -2413,94 +2887,72 @@ class FinanceApp(QMainWindow):
         current_month = today.month
         current_year = today.year
         
-        # First, ensure current month summary is up to date
-        # Close connection before calling update_monthly_summary to avoid locks
-        conn.close()
-        self.update_monthly_summary(current_month, current_year)
-        
-        # Reopen connection to get updated values
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Now get the updated values from monthly_summary
-        cursor.execute("""
-            SELECT total_payments, total_income, savings_amount, net_savings
-            FROM monthly_summary
-            WHERE month = ? AND year = ?
-        """, (current_month, current_year))
-        
-        summary_result = cursor.fetchone()
-        if summary_result:
-            total_payments, total_income, savings, net_savings = summary_result
-            total_payments = total_payments if total_payments else 0
-            total_income = total_income if total_income else 0
-            savings = savings if savings else 0
-            net_savings = net_savings if net_savings else 0
+        # Bring the current month summary up to date; the upsert hands back its
+        # totals when they changed and writes nothing when they didn't
+        summaries = self.update_monthly_summary({(current_month, current_year)})
+        if summaries:
+            _, _, total_payments, total_income, savings, net_savings = summaries[0]
         else:
-            # Fallback: calculate from payment_history if no summary exists
             cursor.execute("""
-                SELECT 
-                    COALESCE(SUM(CASE WHEN payment_type IN ('recurring', 'one_time') THEN amount ELSE 0 END), 0) as total_payments
-                FROM payment_history
-                WHERE month = ? AND year = ?
+                SELECT total_payments, total_income, savings_amount, net_savings
+                FROM monthly_summary WHERE month = ? AND year = ?
             """, (current_month, current_year))
-            result = cursor.fetchone()
-            total_payments = result[0] if result[0] else 0
-            
-            # For current month, use total scheduled recurring income
-            cursor.execute("SELECT amount FROM recurring_income")
-            recurring_income_list = cursor.fetchall()
-            total_income = sum(income[0] for income in recurring_income_list) if recurring_income_list else 0
-            
-            savings = 0
-            net_savings = total_income - total_payments - savings
+            total_payments, total_income, savings, net_savings = cursor.fetchone()
         
         # Update summary label
         self.summary_label.setText(f"""
-            <b>Current Month ({datetime(current_year, current_month, 1).strftime('%B %Y')}):</b><br>
-            Total Payments: £{total_payments:,.2f}<br>
-            Total Income: £{total_income:,.2f}<br>
-            Savings: £{savings:,.2f}<br>
-            <b>Net Savings: £{net_savings:,.2f}</b>
+            <b>Current Month ({month_label(current_month, current_year)}):</b><br>
+            Total Payments: {gbp(total_payments)}<br>
+            Total Income: {gbp(total_income)}<br>
+            Savings: {gbp(savings)}<br>
+            <b>Net Savings: {gbp(net_savings)}</b>
         """)
         
         self.savings_input.setValue(savings)
         
-        # Load all monthly summaries
+        # Load monthly summaries a page at a time; the rest arrive as the table scrolls
+        cursor.execute("SELECT COUNT(*) FROM monthly_summary")
+        total_count = cursor.fetchone()[0]
+        
+        with batched(self.history_table):
+            self.history_table.model().set_paged(total_count, self.fetch_history_page)
+    
+    def fetch_history_page(self, offset, limit):
+        """Load and format one page of monthly summaries for the history table"""
+        cursor = self.db.get_connection().cursor()
         cursor.execute("""
             SELECT month, year, total_payments, total_income, savings_amount, net_savings
             FROM monthly_summary
             ORDER BY year DESC, month DESC
-        """)
-        summaries = cursor.fetchall()
-        conn.close()
+            LIMIT ? OFFSET ?
+        """, (limit, offset))
         
-        # Clear existing table and buttons
-        self.history_table.setRowCount(0)
-        self.history_table.setRowCount(len(summaries))
+        rows = []
+        colors = {}
+        records = []
         
-        for row_idx, summary in enumerate(summaries):
+        for row_idx, summary in enumerate(cursor, start=offset):
             month, year, payments, income, savings, net = summary
-            month_name = datetime(year, month, 1).strftime("%B %Y")
-            
-            self.history_table.setItem(row_idx, 0, QTableWidgetItem(month_name))
-            self.history_table.setItem(row_idx, 1, QTableWidgetItem(f"£{payments:,.2f}"))
-            self.history_table.setItem(row_idx, 2, QTableWidgetItem(f"£{income:,.2f}"))
-            self.history_table.setItem(row_idx, 3, QTableWidgetItem(f"£{savings:,.2f}"))
-            
-            net_item = QTableWidgetItem(f"£{net:,.2f}")
-            if net < 0:
-                net_item.setForeground(Qt.GlobalColor.red)
-            else:
-                net_item.setForeground(Qt.GlobalColor.green)
-            self.history_table.setItem(row_idx, 4, net_item)
-            
-            # View details button - use a closure to capture month and year correctly
-            def make_view_handler(m, y):
-                return lambda: self.view_month_details(m, y)
-            view_btn = QPushButton("View Details")
-            view_btn.clicked.connect(make_view_handler(month, year))
-            self.history_table.setCellWidget(row_idx, 5, view_btn)
+            month_name = month_label(month, year)
+            
+            rows.append((
+                month_name,
+                payments,
+                income,
+                savings,
+                net,
+                "",
+                "",
+            ))
+            colors[(row_idx, 4)] = Qt.GlobalColor.red if net < 0 else Qt.GlobalColor.green
+            records.append((month, year))
+        
+        return rows, colors, records
+    
+    def on_history_details_clicked(self, index):
+        """Show the details of the month whose View Details button was clicked"""
+        month, year = self.history_table.model().records[index.row()]
+        self.view_month_details(month, year)
     
     def refresh_history(self):
         """Refresh history by recalculating all monthly summaries from payment history"""
@@ -2508,77 +2960,37 @@ class FinanceApp(QMainWindow):
         cursor = conn.cursor()
         
         try:
-            # Get all unique month/year combinations from payment_history
-            cursor.execute("""
-                SELECT DISTINCT month, year 
-                FROM payment_history
-                ORDER BY year DESC, month DESC
-            """)
-            months_from_history = cursor.fetchall()
-            
-            # Also get all months from monthly_summary (to preserve savings amounts)
+            # Every month with payment history or an existing summary (whose
+            # savings amount the recalculation keeps), deduplicated by UNION.
+            # Months whose summary is already right are skipped by the write itself
             cursor.execute("""
-                SELECT DISTINCT month, year 
-                FROM monthly_summary
-                ORDER BY year DESC, month DESC
+                SELECT month, year FROM payment_history
+                UNION
+                SELECT month, year FROM monthly_summary
             """)
-            months_from_summary = cursor.fetchall()
+            all_months = set(cursor.fetchall())
             
-            # Store savings amounts before recalculating to preserve them
-            savings_map = {}
-            for month, year in months_from_summary:
-                cursor.execute("""
-                    SELECT savings_amount FROM monthly_summary
-                    WHERE month = ? AND year = ?
-                """, (month, year))
-                result = cursor.fetchone()
-                if result and result[0]:
-                    savings_map[(month, year)] = result[0]
-            
-            # Combine and get unique months
-            all_months = set(months_from_history + months_from_summary)
-            
-            # Always include current month
+            # Always include current month (its income follows the recurring
+            # income schedule, which has no history rows to compare against)
             today = datetime.today().date()
             all_months.add((today.month, today.year))
             
-            conn.close()
-            
             if not all_months:
                 QMessageBox.information(self, "No History", "No payment history found to refresh.")
                 return
             
-            # Recalculate monthly summaries for each month
-            # This will preserve savings amounts from the map
-            updated_count = 0
-            for month, year in sorted(all_months, key=lambda x: (x[1], x[0]), reverse=True):
-                # Temporarily set savings in monthly_summary if it exists in our map
-                if (month, year) in savings_map:
-                    temp_conn = self.db.get_connection()
-                    temp_cursor = temp_conn.cursor()
-                    temp_cursor.execute("""
-                        INSERT OR REPLACE INTO monthly_summary (month, year, savings_amount, updated_at)
-                        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                    """, (month, year, savings_map[(month, year)]))
-                    temp_conn.commit()
-                    temp_conn.close()
-                
-                # Now update the summary (this will recalculate payments/income but preserve savings)
-                self.update_monthly_summary(month, year)
-                updated_count += 1
+            # Recalculate every month's summary in one statement
+            self.update_monthly_summary(all_months)
+            updated_count = len(all_months)
             
             # Reload history table and summary
-            self.load_history()
-            
-            # Also refresh summary tab to show updated data
-            self.load_summary()
+            self.schedule_refresh('load_history', 'load_summary')
             
             QMessageBox.information(self, "History Refreshed", 
                 f"Successfully refreshed history for {updated_count} month(s).")
         
         except Exception as e:
-            if conn:
-                conn.close()
+            conn.rollback()
             QMessageBox.critical(self, "Error", f"Failed to refresh history: {str(e)}")
     
     def save_current_month_savings(self):
@@ -2586,26 +2998,16 @@ class FinanceApp(QMainWindow):
         savings_amount = self.savings_input.value()
         
         conn = self.db.get_connection()
-        cursor = conn.cursor()
         
         try:
-            # Update or insert monthly summary
-            cursor.execute("""
-                INSERT OR REPLACE INTO monthly_summary (month, year, savings_amount, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (today.month, today.year, savings_amount))
-            
-            conn.commit()
-            conn.close()
-            
-            # Recalculate net savings AFTER closing connection
-            self.update_monthly_summary(today.month, today.year)
+            # Store the savings amount and recalculate net savings in one write
+            month = (today.month, today.year)
+            self.update_monthly_summary({month}, savings={month: savings_amount})
             
             self.load_history()
-            QMessageBox.information(self, "Success", f"Savings amount saved for {today.strftime('%B %Y')}.")
+            QMessageBox.information(self, "Success", f"Savings amount saved for {month_label(today.month, today.year)}.")
         except Exception as e:
             conn.rollback()
-            conn.close()
             QMessageBox.critical(self, "Error", f"Failed to save savings: {str(e)}")
     
     def create_calendar_tab(self):
@@ -2670,6 +3072,19 @@ class FinanceApp(QMainWindow):
             }
         """)
         
+        # Day colors, built once and reused by every refresh
+        self.calendar_formats = {}
+        for kind, foreground, background in (
+            ('outgoing', "#ff6b6b", "#2d1a1a"),
+            ('incoming', "#51cf66", "#1a2d1a"),
+            ('mixed', "#ffd43b", "#2d2d1a"),
+        ):
+            day_format = QTextCharFormat()
+            day_format.setForeground(QColor(foreground))
+            day_format.setBackground(QColor(background))
+            day_format.setFontWeight(QFont.Weight.Bold)
+            self.calendar_formats[kind] = day_format
+        
         # Connect calendar signals
         self.calendar.selectionChanged.connect(self.on_calendar_date_selected)
         self.calendar.currentPageChanged.connect(self.on_calendar_month_changed)
@@ -2731,177 +3146,38 @@ class FinanceApp(QMainWindow):
         current_month = selected_date.month()
         current_year = selected_date.year()
         
-        # Calculate daily totals
-        daily_totals = self.calculate_daily_totals(current_month, current_year)
-        
-        # Color code calendar dates
-        red_format = QTextCharFormat()
-        red_format.setForeground(QColor("#ff6b6b"))
-        red_format.setBackground(QColor("#2d1a1a"))
-        red_format.setFontWeight(QFont.Weight.Bold)
-        
-        green_format = QTextCharFormat()
-        green_format.setForeground(QColor("#51cf66"))
-        green_format.setBackground(QColor("#1a2d1a"))
-        green_format.setFontWeight(QFont.Weight.Bold)
-        
-        mixed_format = QTextCharFormat()
-        mixed_format.setForeground(QColor("#ffd43b"))
-        mixed_format.setBackground(QColor("#2d2d1a"))
-        mixed_format.setFontWeight(QFont.Weight.Bold)
+        # Only the days that have payments or income come back from SQLite
+        last_day = QDate(current_year, current_month, 1).daysInMonth()
+        day_totals = self.calendar_month_totals(current_month, current_year, last_day)
         
-        # Reset all dates first
-        for day in range(1, 32):
-            try:
-                date = QDate(current_year, current_month, day)
-                if date.isValid():
-                    self.calendar.setDateTextFormat(date, QTextCharFormat())
-            except:
-                pass
+        # Reset all dates first (a null date clears every format in one call)
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat())
         
         # Apply colors based on totals
-        for day, totals in daily_totals.items():
+        formats = self.calendar_formats
+        for day, outgoing, incoming in day_totals:
             try:
-                date = QDate(current_year, current_month, day)
-                if date.isValid():
-                    outgoing = totals.get('outgoing', 0)
-                    incoming = totals.get('incoming', 0)
-                    
+                qdate = QDate(current_year, current_month, day)
+                if qdate.isValid():
                     if outgoing > 0 and incoming > 0:
-                        self.calendar.setDateTextFormat(date, mixed_format)
+                        self.calendar.setDateTextFormat(qdate, formats['mixed'])
                     elif outgoing > 0:
-                        self.calendar.setDateTextFormat(date, red_format)
+                        self.calendar.setDateTextFormat(qdate, formats['outgoing'])
                     elif incoming > 0:
-                        self.calendar.setDateTextFormat(date, green_format)
+                        self.calendar.setDateTextFormat(qdate, formats['incoming'])
             except:
                 pass
         
         # Update details for selected date
         self.on_calendar_date_selected()
     
-    def calculate_daily_totals(self, month, year):
-        """Calculate total outgoing and incoming amounts for each day in the month"""
-        daily_totals = {}
-        
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            # Get all active recurring payments
-            cursor.execute("""
-                SELECT id, name, amount, payment_day, payment_type
-                FROM recurring_payments
-                WHERE COALESCE(is_active, 1) = 1
-            """)
-            recurring_payments = cursor.fetchall()
-            
-            # Get all one-time payments for this month
-            cursor.execute("""
-                SELECT name, amount, payment_date
-                FROM one_time_payments
-                WHERE strftime('%Y-%m', payment_date) = ?
-            """, (f"{year}-{month:02d}",))
-            one_time_payments = cursor.fetchall()
-            
-            # Get all recurring income
-            cursor.execute("SELECT id, name, amount, income_day FROM recurring_income")
-            recurring_income = cursor.fetchall()
-            
-            # Calculate last day of month
-            if month == 12:
-                next_month = 1
-                next_year = year + 1
-            else:
-                next_month = month + 1
-                next_year = year
-            
-            last_day = (datetime(next_year, next_month, 1) - timedelta(days=1)).day
-            
-            # Process recurring payments
-            for payment_id, name, amount, payment_day, payment_type in recurring_payments:
-                # Calculate payment date for this month
-                try:
-                    payment_date = datetime(year, month, int(payment_day)).date()
-                except ValueError:
-                    # Handle day 31 in months with fewer days
-                    payment_date = datetime(year, month, last_day).date()
-                
-                day = payment_date.day
-                if day not in daily_totals:
-                    daily_totals[day] = {'outgoing': 0, 'incoming': 0, 'details': {'outgoing': [], 'incoming': []}}
-                
-                # Both debit and credit payments are money going out
-                # The distinction is just for tracking purposes (e.g., credit card vs debit card)
-                payment_type_label = "Credit" if payment_type == 'credit' else "Debit"
-                daily_totals[day]['outgoing'] += amount
-                daily_totals[day]['details']['outgoing'].append(f"{name} ({payment_type_label}): £{amount:,.2f}")
-            
-            # Process one-time payments
-            for name, amount, payment_date_str in one_time_payments:
-                try:
-                    if isinstance(payment_date_str, str):
-                        payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d").date()
-                    else:
-                        payment_date = payment_date_str
-                    
-                    day = payment_date.day
-                    if day not in daily_totals:
-                        daily_totals[day] = {'outgoing': 0, 'incoming': 0, 'details': {'outgoing': [], 'incoming': []}}
-                    
-                    daily_totals[day]['outgoing'] += amount
-                    daily_totals[day]['details']['outgoing'].append(f"{name} (one-time): £{amount:,.2f}")
-                except Exception as e:
-                    print(f"Error processing one-time payment: {e}")
-                    continue
-            
-            # Process recurring income
-            for income_id, name, amount, income_day in recurring_income:
-                # Calculate income date for this month
-                try:
-                    income_date = datetime(year, month, int(income_day)).date()
-                except ValueError:
-                    # Handle day 31 in months with fewer days
-                    income_date = datetime(year, month, last_day).date()
-                
-                day = income_date.day
-                if day not in daily_totals:
-                    daily_totals[day] = {'outgoing': 0, 'incoming': 0, 'details': {'outgoing': [], 'incoming': []}}
-                
-                daily_totals[day]['incoming'] += amount
-                daily_totals[day]['details']['incoming'].append(f"{name}: £{amount:,.2f}")
-        
-        finally:
-            conn.close()
-        
-        # Calculate running totals for each day
-        running_outgoing = 0
-        running_incoming = 0
-        
-        # Calculate last day of month
-        if month == 12:
-            next_month = 1
-            next_year = year + 1
-        else:
-            next_month = month + 1
-            next_year = year
-        
-        last_day = (datetime(next_year, next_month, 1) - timedelta(days=1)).day
-        
-        # Process each day from 1 to last_day
-        for day in range(1, last_day + 1):
-            if day in daily_totals:
-                running_outgoing += daily_totals[day]['outgoing']
-                running_incoming += daily_totals[day]['incoming']
-            
-            # Add running totals to each day's data
-            if day not in daily_totals:
-                daily_totals[day] = {'outgoing': 0, 'incoming': 0, 'details': {'outgoing': [], 'incoming': []}}
-            
-            daily_totals[day]['running_outgoing'] = running_outgoing
-            daily_totals[day]['running_incoming'] = running_incoming
-            daily_totals[day]['running_net'] = running_incoming - running_outgoing
-        
-        return daily_totals
+    def calendar_month_totals(self, month, year, last_day):
+        """Per-day totals of a month, re-queried only when the month or the database changed"""
+        # Keyed like the summary cache, so writes from outside the app count too
+        key = (month, year, self.db.data_stamp())
+        if self.calendar_totals is None or self.calendar_totals[0] != key:
+            self.calendar_totals = (key, self.db.calendar_day_totals(month, year, last_day))
+        return self.calendar_totals[1]
     
     def on_calendar_date_selected(self):
         """Handle calendar date selection"""
@@ -2910,124 +3186,100 @@ class FinanceApp(QMainWindow):
         month = selected_date.month()
         year = selected_date.year()
         
-        # Calculate daily totals
-        daily_totals = self.calculate_daily_totals(month, year)
+        last_day = selected_date.daysInMonth()
+        
+        # Usually the totals the calendar was just colored from
+        day_totals = self.calendar_month_totals(month, year, last_day)
         
         # Format date
         date_str = selected_date.toString("dddd, MMMM d, yyyy")
         
         # Build details text
-        details_html = f"<h2 style='color: #667eea;'>{date_str}</h2><br>"
-        
-        if day in daily_totals:
-            totals = daily_totals[day]
-            outgoing = totals.get('outgoing', 0)
-            incoming = totals.get('incoming', 0)
-            running_outgoing = totals.get('running_outgoing', 0)
-            running_incoming = totals.get('running_incoming', 0)
-            running_net = totals.get('running_net', 0)
+        parts = [f"<h2 style='color: {DETAILS_TITLE_COLOR};'>{date_str}</h2><br>"]
+        
+        if 1 <= day <= last_day:
+            outgoing = incoming = running_outgoing = running_incoming = 0
+            for total_day, day_outgoing, day_incoming in day_totals:
+                if total_day == day:
+                    outgoing, incoming = day_outgoing, day_incoming
+                if total_day <= day:
+                    running_outgoing += day_outgoing
+                    running_incoming += day_incoming
+            running_net = running_incoming - running_outgoing
+            
+            # Only the selected day's entries are fetched for the lists below
+            details = {'outgoing': [], 'incoming': []}
+            for direction, label, amount in self.db.calendar_day_entries(month, year, day, last_day):
+                details[direction].append(f"{label}: {gbp(amount)}")
             
             # Day-specific transactions
-            details_html += "<h3 style='color: #ffffff; border-bottom: 2px solid #4a5568; padding-bottom: 5px;'>This Day's Transactions</h3>"
+            parts.append(f"<h3 style='color: {DETAILS_TEXT_COLOR}; border-bottom: 2px solid {DETAILS_RULE_COLOR}; padding-bottom: 5px;'>This Day's Transactions</h3>")
             
             if outgoing > 0:
-                details_html += f"<h4 style='color: #ff6b6b;'>💸 Money Going Out: £{outgoing:,.2f}</h4>"
-                details_html += "<ul>"
-                for detail in totals['details']['outgoing']:
-                    details_html += f"<li style='color: #ff8787;'>{detail}</li>"
-                details_html += "</ul><br>"
+                parts.append(f"<h4 style='color: {DETAILS_OUT_COLOR};'>💸 Money Going Out: {gbp(outgoing)}</h4>")
+                parts.append("<ul>")
+                for detail in details['outgoing']:
+                    parts.append(f"<li style='color: {DETAILS_OUT_ITEM_COLOR};'>{detail}</li>")
+                parts.append("</ul><br>")
             
             if incoming > 0:
-                details_html += f"<h4 style='color: #51cf66;'>💰 Money Coming In: £{incoming:,.2f}</h4>"
-                details_html += "<ul>"
-                for detail in totals['details']['incoming']:
-                    details_html += f"<li style='color: #69db7c;'>{detail}</li>"
-                details_html += "</ul><br>"
+                parts.append(f"<h4 style='color: {DETAILS_IN_COLOR};'>💰 Money Coming In: {gbp(incoming)}</h4>")
+                parts.append("<ul>")
+                for detail in details['incoming']:
+                    parts.append(f"<li style='color: {DETAILS_IN_ITEM_COLOR};'>{detail}</li>")
+                parts.append("</ul><br>")
             
             if outgoing == 0 and incoming == 0:
-                details_html += "<p style='color: #a0a0a0;'>No transactions scheduled for this day.</p><br>"
+                parts.append(f"<p style='color: {DETAILS_MUTED_COLOR};'>No transactions scheduled for this day.</p><br>")
             
             net = incoming - outgoing
             if net > 0:
-                details_html += f"<h4 style='color: #51cf66;'>📊 Day's Net: +£{net:,.2f}</h4><br>"
+                parts.append(f"<h4 style='color: {DETAILS_IN_COLOR};'>📊 Day's Net: +{gbp(net)}</h4><br>")
             elif net < 0:
-                details_html += f"<h4 style='color: #ff6b6b;'>📊 Day's Net: £{net:,.2f}</h4><br>"
+                parts.append(f"<h4 style='color: {DETAILS_OUT_COLOR};'>📊 Day's Net: {gbp(net)}</h4><br>")
             else:
-                details_html += f"<h4 style='color: #ffffff;'>📊 Day's Net: £0.00</h4><br>"
+                parts.append(f"<h4 style='color: {DETAILS_TEXT_COLOR};'>📊 Day's Net: £0.00</h4><br>")
             
             # Running totals from start of month
-            details_html += "<h3 style='color: #ffffff; border-bottom: 2px solid #4a5568; padding-bottom: 5px; margin-top: 15px;'>Running Totals (Month to Date)</h3>"
-            details_html += f"<h4 style='color: #ff6b6b;'>💸 Total Outgoing: £{running_outgoing:,.2f}</h4>"
-            details_html += f"<h4 style='color: #51cf66;'>💰 Total Incoming: £{running_incoming:,.2f}</h4>"
+            parts.append(f"<h3 style='color: {DETAILS_TEXT_COLOR}; border-bottom: 2px solid {DETAILS_RULE_COLOR}; padding-bottom: 5px; margin-top: 15px;'>Running Totals (Month to Date)</h3>")
+            parts.append(f"<h4 style='color: {DETAILS_OUT_COLOR};'>💸 Total Outgoing: {gbp(running_outgoing)}</h4>")
+            parts.append(f"<h4 style='color: {DETAILS_IN_COLOR};'>💰 Total Incoming: {gbp(running_incoming)}</h4>")
             
             if running_net > 0:
-                details_html += f"<h4 style='color: #51cf66;'>📊 Running Net: +£{running_net:,.2f}</h4>"
+                parts.append(f"<h4 style='color: {DETAILS_IN_COLOR};'>📊 Running Net: +{gbp(running_net)}</h4>")
             elif running_net < 0:
-                details_html += f"<h4 style='color: #ff6b6b;'>📊 Running Net: £{running_net:,.2f}</h4>"
+                parts.append(f"<h4 style='color: {DETAILS_OUT_COLOR};'>📊 Running Net: {gbp(running_net)}</h4>")
             else:
-                details_html += f"<h4 style='color: #ffffff;'>📊 Running Net: £0.00</h4>"
+                parts.append(f"<h4 style='color: {DETAILS_TEXT_COLOR};'>📊 Running Net: £0.00</h4>")
         else:
-            details_html += "<p style='color: #a0a0a0;'>No payments or income scheduled for this day.</p>"
+            parts.append(f"<p style='color: {DETAILS_MUTED_COLOR};'>No payments or income scheduled for this day.</p>")
         
-        self.day_details_text.setHtml(details_html)
+        self.day_details_text.setHtml("".join(parts))
     
     def on_calendar_month_changed(self, year, month):
         """Handle calendar month change"""
         self.refresh_calendar()
     
-    def update_monthly_summary(self, month, year):
-        """Update monthly summary with current totals"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        today = datetime.today().date()
-        is_current_month = (month == today.month and year == today.year)
-        
-        # Calculate total payments from payment history (only what's been paid)
-        cursor.execute("""
-            SELECT 
-                COALESCE(SUM(CASE WHEN payment_type IN ('recurring', 'one_time') THEN amount ELSE 0 END), 0) as total_payments
-            FROM payment_history
-            WHERE month = ? AND year = ?
-        """, (month, year))
-        
-        result = cursor.fetchone()
-        total_payments = result[0] if result[0] else 0
+    def update_monthly_summary(self, months, cursor=None, savings=None):
+        """Update the monthly summaries of a set of (month, year) pairs with current totals
+        
+        Pass the cursor of an open transaction to update the summaries as part of
+        that transaction; otherwise the update is committed straight away.
+        savings maps (month, year) to a new savings amount to store as well.
+        Returns the (month, year, total_payments, total_income, savings_amount,
+        net_savings) rows that changed.
+        """
+        if cursor is not None:
+            return self.db.write_month_summaries(cursor, months, savings)
         
-        # Calculate total income
-        if is_current_month:
-            # For current month: show all scheduled recurring income (not just received)
-            cursor.execute("SELECT amount FROM recurring_income")
-            recurring_income_list = cursor.fetchall()
-            total_income = sum(income[0] for income in recurring_income_list) if recurring_income_list else 0
+        conn = self.db.get_connection()
+        summaries = self.db.write_month_summaries(conn.cursor(), months, savings)
+        if summaries:
+            self.commit_changes(conn)
         else:
-            # For past months: show only what was actually received
-            cursor.execute("""
-                SELECT COALESCE(SUM(amount), 0) FROM payment_history
-                WHERE payment_type = 'income' AND month = ? AND year = ?
-            """, (month, year))
-            income_result = cursor.fetchone()
-            total_income = income_result[0] if income_result and income_result[0] else 0
-        
-        # Get savings amount
-        cursor.execute("""
-            SELECT savings_amount FROM monthly_summary
-            WHERE month = ? AND year = ?
-        """, (month, year))
-        savings_result = cursor.fetchone()
-        savings = savings_result[0] if savings_result else 0
-        
-        net_savings = total_income - total_payments - savings
-        
-        # Update monthly summary
-        cursor.execute("""
-            INSERT OR REPLACE INTO monthly_summary 
-            (month, year, total_payments, total_income, savings_amount, net_savings, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (month, year, total_payments, total_income, savings, net_savings))
-        
-        conn.commit()
-        conn.close()
+            # Nothing was written, so the caches keyed on the database stay valid
+            conn.commit()
+        return summaries
     
     def view_month_details(self, month, year):
         conn = self.db.get_connection()
@@ -3041,9 +3293,8 @@ class FinanceApp(QMainWindow):
         """, (month, year))
         
         transactions = cursor.fetchall()
-        conn.close()
         
-        details = f"<b>Details for {datetime(year, month, 1).strftime('%B %Y')}:</b><br><br>"
+        details = f"<b>Details for {month_label(month, year)}:</b><br><br>"
         
         if not transactions:
             details += "No transactions recorded."
@@ -3051,18 +3302,18 @@ class FinanceApp(QMainWindow):
             details += "<table border='1' cellpadding='5'>"
             details += "<tr><th>Type</th><th>Name</th><th>Amount</th><th>Date</th></tr>"
             for trans in transactions:
-                trans_type, name, amount, date = trans
-                date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-                details += f"<tr><td>{trans_type}</td><td>{name}</td><td>£{amount:,.2f}</td><td>{date_obj.strftime('%d/%m/%Y')}</td></tr>"
+                trans_type, name, amount, date_str = trans
+                details += f"<tr><td>{trans_type}</td><td>{name}</td><td>{gbp(amount)}</td><td>{display_date(parse_date(date_str))}</td></tr>"
             details += "</table>"
         
         msg = QMessageBox(self)
-        msg.setWindowTitle(f"Details - {datetime(year, month, 1).strftime('%B %Y')}")
+        msg.setWindowTitle(f"Details - {month_label(month, year)}")
         msg.setText(details)
         msg.exec()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_QSS + DIALOG_QSS)
     window = FinanceApp()
     window.show()
     sys.exit(app.exec())
@@ -5,80 +5,100 @@ Checks for upcoming payments and sends notifications about financial status
 """
 import sys
 import os
+import calendar
 import sqlite3
-from datetime import datetime, timedelta
+import subprocess
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from Foundation import NSUserNotification, NSUserNotificationCenter
+except ImportError:
+    # pyobjc not installed, notifications go through osascript instead
+    NSUserNotification = None
+
 # Add the app directory to the path
 DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "finance.db")
 
-def send_notification(title, message, subtitle=""):
-    """Send a macOS notification using osascript"""
-    script = f'''
-    display notification "{message}" with title "{title}" subtitle "{subtitle}"
-    '''
-    os.system(f"osascript -e '{script}'")
+def applescript_string(value):
+    """Quote a value as an AppleScript string literal"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def send_notification(title, message, subtitle="", queue=None):
+    """Send a macOS notification, directly through pyobjc when available
+    
+    Otherwise the osascript statement is added to queue for
+    flush_notifications(), or shown straight away when there is no queue.
+    """
+    # The center is None outside an app bundle (plain python, launchd), and
+    # the deprecated API may fail outright; osascript covers both cases
+    center = NSUserNotificationCenter.defaultUserNotificationCenter() if NSUserNotification is not None else None
+    if center is not None:
+        try:
+            notification = NSUserNotification.alloc().init()
+            notification.setTitle_(title)
+            notification.setSubtitle_(subtitle)
+            notification.setInformativeText_(message)
+            center.deliverNotification_(notification)
+            return
+        except Exception:
+            pass
+    
+    statement = (
+        f"display notification {applescript_string(message)} "
+        f"with title {applescript_string(title)} subtitle {applescript_string(subtitle)}"
+    )
+    if queue is None:
+        flush_notifications([statement])
+    else:
+        queue.append(statement)
+
+def flush_notifications(queue):
+    """Show the queued osascript notifications with a single osascript launch"""
+    if not queue:
+        return
+    args = ["osascript"]
+    for statement in queue:
+        args += ["-e", statement]
+    queue.clear()
+    subprocess.run(args, check=False)
 
 def get_connection():
-    """Get database connection"""
+    """Get database connection, shared by every check in a run"""
     conn = sqlite3.connect(DB_FILE, timeout=20.0)
     conn.execute("PRAGMA journal_mode=WAL")
+    # Safe under WAL and skips the extra fsync on every commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
     return conn
 
+@lru_cache(maxsize=1024)
+def parse_date(value):
+    """Date part of a stored 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' string"""
+    # The same few dates repeat across rows, so cache the parse
+    return date.fromisoformat(value[:10])
+
+@lru_cache(maxsize=256)
+def day_in_month(year, month, day):
+    """Date for a payment day, clamped to the last day of short months"""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
 def calculate_payment_dates(payment_day, last_paid_date, current_month, current_year):
     """Calculate payment dates for a recurring payment"""
-    today = datetime.today().date()
-    
-    # Calculate this month's payment date
-    try:
-        this_month_date = datetime(current_year, current_month, min(payment_day, 28)).date()
-        # Adjust if day doesn't exist in month (e.g., Feb 30 -> Feb 28)
-        while this_month_date.month != current_month:
-            this_month_date -= timedelta(days=1)
-    except ValueError:
-        # If day is invalid, use last day of month
-        if current_month == 12:
-            this_month_date = datetime(current_year, 12, 31).date()
-        else:
-            this_month_date = datetime(current_year, current_month + 1, 1).date() - timedelta(days=1)
-    
-    # Calculate next month's payment date
-    if current_month == 12:
-        next_month_date = datetime(current_year + 1, 1, min(payment_day, 28)).date()
-    else:
-        next_month_date = datetime(current_year, current_month + 1, min(payment_day, 28)).date()
-    
-    # Adjust if day doesn't exist
-    while next_month_date.month != (current_month % 12 + 1 if current_month < 12 else 1):
-        next_month_date -= timedelta(days=1)
-    
-    # Calculate last month's payment date
-    if current_month == 1:
-        last_month_date = datetime(current_year - 1, 12, min(payment_day, 28)).date()
-    else:
-        last_month_date = datetime(current_year, current_month - 1, min(payment_day, 28)).date()
-    
-    while last_month_date.month != (current_month - 1 if current_month > 1 else 12):
-        last_month_date -= timedelta(days=1)
+    # Payment days past the end of a month fall on its last day, as in the app
+    next_year, next_month = (current_year + 1, 1) if current_month == 12 else (current_year, current_month + 1)
+    last_year, last_month = (current_year - 1, 12) if current_month == 1 else (current_year, current_month - 1)
+    this_month_date = day_in_month(current_year, current_month, payment_day)
+    next_month_date = day_in_month(next_year, next_month, payment_day)
+    last_month_date = day_in_month(last_year, last_month, payment_day)
     
     # Determine which date to use based on last_paid_date
     if last_paid_date:
-        # Try to parse the date
         try:
-            if isinstance(last_paid_date, str):
-                # Try datetime format first
-                try:
-                    last_paid = datetime.strptime(last_paid_date, "%Y-%m-%d %H:%M:%S").date()
-                except ValueError:
-                    # Try date-only format
-                    try:
-                        last_paid = datetime.strptime(last_paid_date, "%Y-%m-%d").date()
-                    except ValueError:
-                        # Fallback: extract date part
-                        last_paid = datetime.strptime(str(last_paid_date).split()[0], "%Y-%m-%d").date()
-            else:
-                last_paid = last_paid_date
-        except:
+            last_paid = parse_date(last_paid_date) if isinstance(last_paid_date, str) else last_paid_date
+        except ValueError:
             last_paid = None
     else:
         last_paid = None
@@ -91,25 +111,35 @@ def calculate_payment_dates(payment_day, last_paid_date, current_month, current_
     
     return last_month_date, current_date, next_month_date
 
-def check_upcoming_payments():
+def check_upcoming_payments(conn):
     """Check for upcoming payments in the next 7 days"""
     today = datetime.today().date()
-    conn = get_connection()
     cursor = conn.cursor()
     
     upcoming_payments = []
     
-    # Check recurring payments
+    current_month = today.month
+    current_year = today.year
+    window_end = today + timedelta(days=7)
+    # Days of the next month inside the window, if it crosses the month end
+    wrap_day = window_end.day if window_end.month != current_month else 0
+    
+    # Check recurring payments, only those whose (clamped) day falls in the window
     cursor.execute("""
         SELECT id, name, amount, payment_day, 
                COALESCE(payment_type, 'debit') as payment_type,
                last_paid_date 
         FROM recurring_payments
-    """)
+        WHERE MIN(payment_day, ?) BETWEEN ? AND ? OR payment_day <= ?
+    """, (calendar.monthrange(current_year, current_month)[1], today.day, today.day + 7, wrap_day))
     recurring_payments = cursor.fetchall()
     
-    current_month = today.month
-    current_year = today.year
+    # Recurring payments already paid this month, fetched once
+    cursor.execute("""
+        SELECT payment_id FROM payment_history
+        WHERE payment_type = 'recurring' AND month = ? AND year = ?
+    """, (current_month, current_year))
+    paid_ids = {row[0] for row in cursor.fetchall()}
     
     for payment in recurring_payments:
         payment_id, name, amount, payment_day, payment_type, last_paid_date = payment
@@ -121,14 +151,7 @@ def check_upcoming_payments():
         days_until = (current_date - today).days
         if 0 <= days_until <= 7:
             # Check if already paid this month
-            cursor.execute("""
-                SELECT COUNT(*) FROM payment_history
-                WHERE payment_id = ? AND payment_type = 'recurring'
-                AND month = ? AND year = ?
-            """, (payment_id, current_month, current_year))
-            is_paid = cursor.fetchone()[0] > 0
-            
-            if not is_paid:
+            if payment_id not in paid_ids:
                 upcoming_payments.append({
                     'name': name,
                     'amount': amount,
@@ -140,20 +163,14 @@ def check_upcoming_payments():
     # Check one-time payments
     cursor.execute("""
         SELECT name, amount, payment_date FROM one_time_payments
-        WHERE paid = 0
-    """)
+        WHERE paid = 0 AND payment_date >= ? AND payment_date < ?
+    """, (today.isoformat(), (window_end + timedelta(days=1)).isoformat()))
     one_time_payments = cursor.fetchall()
     
     for payment in one_time_payments:
         name, amount, payment_date_str = payment
         try:
-            if isinstance(payment_date_str, str):
-                try:
-                    payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d %H:%M:%S").date()
-                except ValueError:
-                    payment_date = datetime.strptime(payment_date_str, "%Y-%m-%d").date()
-            else:
-                payment_date = payment_date_str
+            payment_date = parse_date(payment_date_str) if isinstance(payment_date_str, str) else payment_date_str
             
             days_until = (payment_date - today).days
             if 0 <= days_until <= 7:
@@ -167,68 +184,41 @@ def check_upcoming_payments():
         except:
             continue
     
-    conn.close()
     return upcoming_payments
 
-def get_financial_summary():
+def get_financial_summary(conn):
     """Get current month's financial summary"""
     today = datetime.today().date()
     current_month = today.month
     current_year = today.year
+    # Month as a date range so the one-time payment_date index is usable
+    month_start = today.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
     
-    conn = get_connection()
     cursor = conn.cursor()
     
-    # Total income (scheduled)
-    cursor.execute("SELECT COALESCE(SUM(amount), 0) FROM recurring_income")
-    total_income = cursor.fetchone()[0] or 0
-    
-    # Total scheduled payments
-    cursor.execute("SELECT amount, COALESCE(payment_type, 'debit') as payment_type FROM recurring_payments")
-    recurring_payments = cursor.fetchall()
-    total_scheduled = 0
-    total_credit = 0
-    total_debit = 0
-    
-    for payment in recurring_payments:
-        amount = payment[0]
-        payment_type = payment[1] if len(payment) > 1 else 'debit'
-        total_scheduled += amount
-        if payment_type and payment_type.lower() == 'credit':
-            total_credit += amount
-        else:
-            total_debit += amount
-    
-    # One-time payments for this month
-    cursor.execute("""
-        SELECT COALESCE(SUM(amount), 0) FROM one_time_payments
-        WHERE strftime('%m', payment_date) = ? AND strftime('%Y', payment_date) = ?
-    """, (f"{current_month:02d}", str(current_year)))
-    one_time_total = cursor.fetchone()[0] or 0
-    total_debit += one_time_total
-    total_scheduled += one_time_total
-    
-    # Already paid this month
+    # Scheduled income, scheduled payments and this month's paid totals in one
+    # query; paid credit comes from the effective_type stored with each history
+    # row, the same source the app's monthly totals use
     cursor.execute("""
-        SELECT ph.amount, rp.payment_type
-        FROM payment_history ph
-        LEFT JOIN recurring_payments rp ON ph.payment_id = rp.id AND ph.payment_type = 'recurring'
-        WHERE ph.payment_type IN ('recurring', 'one_time') AND ph.month = ? AND ph.year = ?
-    """, (current_month, current_year))
-    paid_payments = cursor.fetchall()
-    
-    already_paid = 0
-    credit_paid = 0
-    debit_paid = 0
-    
-    for paid in paid_payments:
-        amount = paid[0]
-        payment_type = paid[1] if len(paid) > 1 and paid[1] else 'debit'
-        already_paid += amount
-        if payment_type and payment_type.lower() == 'credit':
-            credit_paid += amount
-        else:
-            debit_paid += amount
+        SELECT i.total, rp.total, rp.credit, ot.total, ph.total, ph.credit
+        FROM (SELECT COALESCE(SUM(amount), 0) AS total FROM recurring_income) AS i,
+             (SELECT COALESCE(SUM(amount), 0) AS total,
+                     COALESCE(SUM(CASE WHEN LOWER(payment_type) = 'credit' THEN amount END), 0) AS credit
+              FROM recurring_payments) AS rp,
+             (SELECT COALESCE(SUM(amount), 0) AS total FROM one_time_payments
+              WHERE payment_date >= ? AND payment_date < ?) AS ot,
+             (SELECT COALESCE(SUM(amount), 0) AS total,
+                     COALESCE(SUM(CASE WHEN effective_type = 'credit' THEN amount END), 0) AS credit
+              FROM payment_history
+              WHERE payment_type IN ('recurring', 'one_time') AND month = ? AND year = ?) AS ph
+    """, (month_start.isoformat(), next_month_start.isoformat(), current_month, current_year))
+    total_income, recurring_total, total_credit, one_time_total, already_paid, credit_paid = cursor.fetchone()
+    
+    # One-time payments count as debit
+    total_scheduled = recurring_total + one_time_total
+    total_debit = total_scheduled - total_credit
+    debit_paid = already_paid - credit_paid
     
     # Remaining to pay
     remaining_to_pay = total_scheduled - already_paid
@@ -238,8 +228,6 @@ def get_financial_summary():
     # Net savings
     net_savings = total_income - total_scheduled
     
-    conn.close()
-    
     return {
         'total_income': total_income,
         'total_scheduled': total_scheduled,
@@ -250,13 +238,12 @@ def get_financial_summary():
         'net_savings': net_savings
     }
 
-def check_and_delete_pending_deletions():
+def check_and_delete_pending_deletions(conn, notifications=None):
     """Check if it's a new month and delete payments marked for deletion"""
     today = datetime.today().date()
     current_month = today.month
     current_year = today.year
     
-    conn = get_connection()
     cursor = conn.cursor()
     
     # Ensure app_settings table exists (created by main app, but might not exist yet)
@@ -271,6 +258,9 @@ def check_and_delete_pending_deletions():
     except:
         pass
     
+    # Check, record and delete in one write transaction
+    cursor.execute("BEGIN IMMEDIATE")
+    
     # Get the last month we checked for deletions
     cursor.execute("""
         SELECT value FROM app_settings WHERE key = 'last_deletion_check_month'
@@ -307,111 +297,89 @@ def check_and_delete_pending_deletions():
     # Only delete if we're in a new month
     deleted_count = 0
     if is_new_month:
+        # Delete the payments in one statement, getting their names back
         cursor.execute("""
-            SELECT id, name FROM recurring_payments 
+            DELETE FROM recurring_payments 
             WHERE delete_next_month = 1
+            RETURNING name
         """)
-        pending_deletions = cursor.fetchall()
-        
-        if pending_deletions:
-            deleted_names = []
-            
-            for payment_id, payment_name in pending_deletions:
-                # Delete the payment
-                cursor.execute("DELETE FROM recurring_payments WHERE id = ?", (payment_id,))
-                deleted_count += 1
-                deleted_names.append(payment_name)
-            
-            if deleted_count > 0:
-                conn.commit()
-                # Send notification about deletions
-                names_list = "\n".join([f"• {name}" for name in deleted_names])
-                send_notification(
-                    title="🗑️ Payments Deleted",
-                    subtitle=f"{deleted_count} payment(s) removed",
-                    message=f"New month detected! Removed:\n{names_list}"
-                )
+        deleted_names = [name for name, in cursor.fetchall()]
+        deleted_count = len(deleted_names)
     
     conn.commit()
-    conn.close()
+    
+    if deleted_count > 0:
+        # Send notification about deletions
+        names_list = "\n".join([f"• {name}" for name in deleted_names])
+        send_notification(
+            title="🗑️ Payments Deleted",
+            subtitle=f"{deleted_count} payment(s) removed",
+            message=f"New month detected! Removed:\n{names_list}",
+            queue=notifications
+        )
+    
     return deleted_count
 
-def check_and_disable_expired_payments():
+def check_and_disable_expired_payments(conn, notifications=None):
     """Check for payments that have exceeded their pay period and disable them"""
     today = datetime.today().date()
     current_month = today.month
     current_year = today.year
     
-    conn = get_connection()
     cursor = conn.cursor()
     
-    # Get all active payments with pay periods
+    # Disable active payments whose pay period has run out (months elapsed
+    # since the period started, by calendar month, reached pay_period_months)
+    # in one statement, getting their names back
     cursor.execute("""
-        SELECT id, name, pay_period_months, period_start_date 
-        FROM recurring_payments 
+        UPDATE recurring_payments SET is_active = 0
         WHERE is_active = 1 
         AND pay_period_months IS NOT NULL 
         AND pay_period_months != -1
-    """)
-    payments_with_periods = cursor.fetchall()
-    
-    expired_count = 0
-    expired_names = []
-    
-    for payment_id, name, pay_period_months, period_start_date in payments_with_periods:
-        if period_start_date:
-            try:
-                if isinstance(period_start_date, str):
-                    try:
-                        start_date = datetime.strptime(period_start_date, "%Y-%m-%d %H:%M:%S").date()
-                    except ValueError:
-                        start_date = datetime.strptime(period_start_date, "%Y-%m-%d").date()
-                else:
-                    start_date = period_start_date
-                
-                # Calculate months elapsed
-                months_elapsed = (current_year - start_date.year) * 12 + (current_month - start_date.month)
-                
-                # Check if period has expired
-                if months_elapsed >= pay_period_months:
-                    # Disable the payment
-                    cursor.execute(
-                        "UPDATE recurring_payments SET is_active = 0 WHERE id = ?",
-                        (payment_id,)
-                    )
-                    expired_count += 1
-                    expired_names.append(name)
-            except Exception as e:
-                print(f"Error checking payment {name}: {e}")
-                continue
+        AND period_start_date IS NOT NULL
+        AND (? - CAST(strftime('%Y', period_start_date) AS INTEGER)) * 12
+            + (? - CAST(strftime('%m', period_start_date) AS INTEGER)) >= pay_period_months
+        RETURNING name
+    """, (current_year, current_month))
+    expired_names = [name for name, in cursor.fetchall()]
+    expired_count = len(expired_names)
+    
+    conn.commit()
     
     if expired_count > 0:
-        conn.commit()
         names_list = "\n".join([f"• {name}" for name in expired_names])
         send_notification(
             title="⏰ Payments Expired",
             subtitle=f"{expired_count} payment(s) disabled",
-            message=f"Pay period ended:\n{names_list}"
+            message=f"Pay period ended:\n{names_list}",
+            queue=notifications
         )
     
-    conn.commit()
-    conn.close()
     return expired_count
 
-def main():
-    """Main notification function"""
+def main(notifications=None):
+    """Main notification function
+    
+    notifications collects the osascript fallbacks until the run ends; each
+    caller passes its own list so concurrent runs never share one.
+    """
+    if notifications is None:
+        notifications = []
+    conn = None
     try:
+        conn = get_connection()
+        
         # Check and delete payments marked for deletion (if new month)
-        check_and_delete_pending_deletions()
+        check_and_delete_pending_deletions(conn, notifications)
         
         # Check and disable expired payments
-        check_and_disable_expired_payments()
+        check_and_disable_expired_payments(conn, notifications)
         
         # Check upcoming payments
-        upcoming = check_upcoming_payments()
+        upcoming = check_upcoming_payments(conn)
         
         # Get financial summary
-        summary = get_financial_summary()
+        summary = get_financial_summary(conn)
         
         # Build notification message
         messages = []
@@ -429,7 +397,8 @@ def main():
             send_notification(
                 title="💰 Upcoming Payments",
                 subtitle=f"{len(upcoming)} payment(s) due soon",
-                message=payment_msg
+                message=payment_msg,
+                queue=notifications
             )
         
         # Financial summary notification
@@ -449,15 +418,21 @@ def main():
         send_notification(
             title="📊 Financial Summary",
             subtitle=f"Month: {datetime.today().strftime('%B %Y')}",
-            message=summary_msg
+            message=summary_msg,
+            queue=notifications
         )
         
     except Exception as e:
         send_notification(
             title="❌ Finance App Error",
-            message=f"Error checking finances: {str(e)}"
+            message=f"Error checking finances: {str(e)}",
+            queue=notifications
         )
         sys.exit(1)
+    finally:
+        if conn is not None:
+            conn.close()
+        flush_notifications(notifications)
 
 if __name__ == "__main__":
     main()